@@ -54,6 +54,7 @@ a = Analysis(
         'src.controllers',
         'src.controllers.hotkey_controller',
         'src.controllers.animation_controller',
+        'src.controllers.config_watcher',
         # PyQt6
         'PyQt6',
         'PyQt6.QtCore',
@@ -74,8 +75,9 @@ a = Analysis(
         'pygments.styles',
         # Other dependencies
         'pyperclip',
-        'fuzzywuzzy',
+        'orjson',
         'rapidfuzz',
+        'numpy',
     ],
     hookspath=[],
     hooksconfig={},
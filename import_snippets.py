@@ -155,6 +155,9 @@ def import_snippets_from_json(db_manager: DatabaseManager, input_file: str, merg
         except Exception as e:
             print(f"   ✗ Failed to import '{name}': {e}")
 
+    # Tags were edited through raw sessions above
+    db_manager.invalidate_cache()
+
     print(f"\n✅ Import complete!")
     print(f"   Tags imported: {len(tags)}")
     print(f"   Snippets imported: {imported_count}/{len(snippets)}")
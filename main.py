@@ -22,6 +22,7 @@ from utils.database import DatabaseManager
 from views.gadget_window import GadgetWindow
 from controllers.hotkey_controller import HotkeyController
 from controllers.animation_controller import AnimationController
+from controllers.config_watcher import ConfigWatcher
 
 
 class CodeSnippetApp:
@@ -35,6 +36,7 @@ class CodeSnippetApp:
         self.gadget_window = None
         self.hotkey_controller = None
         self.animation_controller = None
+        self.config_watcher = None
 
     def initialize(self):
         """Initialize all application components."""
@@ -80,6 +82,10 @@ class CodeSnippetApp:
         # Apply initial appearance settings
         self._apply_appearance_settings()
 
+        # Reload configuration when the file is edited externally
+        self.config_watcher = ConfigWatcher(self.config)
+        self.config_watcher.config_changed.connect(self._apply_appearance_settings)
+
         print("Initialization complete!")
 
     def _initialize_sample_data_if_needed(self):
@@ -387,6 +393,10 @@ const increment = () => {
         if self.hotkey_controller:
             self.hotkey_controller.stop()
 
+        # Stop watching the config file
+        if self.config_watcher:
+            self.config_watcher.stop()
+
         # Close database connections
         if self.db_manager:
             self.db_manager.close()
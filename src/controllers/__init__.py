@@ -4,12 +4,15 @@ Controllers package for application logic.
 Provides controllers for:
 - Hotkey management (Ctrl double-tap, global shortcuts)
 - Animation (expand/collapse, fade, slide)
+- Config file watching (reload on external changes)
 """
 
 from src.controllers.hotkey_controller import HotkeyController
 from src.controllers.animation_controller import AnimationController
+from src.controllers.config_watcher import ConfigWatcher
 
 __all__ = [
     'HotkeyController',
     'AnimationController',
+    'ConfigWatcher',
 ]
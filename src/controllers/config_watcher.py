@@ -0,0 +1,111 @@
+"""
+Config watcher for picking up external configuration changes.
+
+Provides event-driven config reloading, including:
+- File system notifications via QFileSystemWatcher (inotify/FSEvents/ReadDirectoryChanges)
+- Coalescing of bursts of change events into a single reload
+- In-memory access to the current configuration
+"""
+
+from pathlib import Path
+from typing import Optional
+
+import orjson
+from PyQt6.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+
+from src.utils.config import CHECKSUM_KEY, Config, get_config_path
+
+
+class ConfigWatcher(QObject):
+    """Reloads the configuration when the config file changes on disk."""
+
+    # Signals
+    config_changed = pyqtSignal()  # Emitted after the config was reloaded
+
+    def __init__(self, config: Config, config_path: Optional[Path] = None,
+                 debounce_ms: int = 200):
+        """
+        Initialize config watcher.
+
+        Args:
+            config: Live configuration object, updated in place on reload
+            config_path: Config file to watch (default: get_config_path())
+            debounce_ms: Delay used to coalesce bursts of change events
+        """
+        super().__init__()
+
+        self._config = config
+        self.config_path = config_path or get_config_path()
+
+        # Editors often write a file in several steps; reload once they settle
+        self.reload_timer = QTimer()
+        self.reload_timer.setSingleShot(True)
+        self.reload_timer.setInterval(debounce_ms)
+        self.reload_timer.timeout.connect(self.reload)
+
+        # Watch the directory as well, so atomic replace-on-save is noticed
+        self.watcher = QFileSystemWatcher()
+        self.watcher.addPath(str(self.config_path.parent))
+        self._watch_file()
+        self.watcher.fileChanged.connect(self._on_path_changed)
+        self.watcher.directoryChanged.connect(self._on_path_changed)
+
+    @property
+    def config(self) -> Config:
+        """Current configuration (read from memory, never from disk)."""
+        return self._config
+
+    def _watch_file(self):
+        """(Re)register the config file, which is dropped when it is replaced."""
+        path = str(self.config_path)
+        if self.config_path.exists() and path not in self.watcher.files():
+            self.watcher.addPath(path)
+
+    def _on_path_changed(self, path: str):
+        """Schedule a reload after a file system notification."""
+        self._watch_file()
+        self.reload_timer.start()
+
+    def reload(self) -> bool:
+        """
+        Reload the config file and update the live configuration.
+
+        Returns:
+            True if the configuration changed
+        """
+        # Parsed here rather than with load_config(), which falls back to
+        # defaults: a half-written or broken file must not reset the
+        # running application
+        try:
+            raw = self.config_path.read_bytes()
+        except OSError:
+            return False  # Missing (e.g. between delete and rename on save)
+        if not raw.strip():
+            return False  # Truncated, not written yet
+
+        try:
+            data = orjson.loads(raw)
+            data.pop(CHECKSUM_KEY, None)
+            # The live config's own class: main.py imports it as utils.config
+            new_config = type(self._config).model_validate(data)
+        except Exception as e:
+            print(f"⚠ Warning: Ignoring invalid config file {self.config_path}: {e}")
+            return False
+
+        new_data = new_config.model_dump()
+        if new_data == self._config.model_dump():
+            return False  # e.g. our own save_config() write
+
+        for key, value in new_data.items():
+            setattr(self._config, key, value)
+
+        print(f"✓ Configuration reloaded: {self.config_path}")
+        self.config_changed.emit()
+        return True
+
+    def stop(self):
+        """Stop watching the config file."""
+        self.reload_timer.stop()
+        paths = self.watcher.files() + self.watcher.directories()
+        if paths:
+            self.watcher.removePaths(paths)
@@ -53,9 +53,9 @@ class Tag(Base):
         path = [self.name]
         current = self.parent
         while current:
-            path.insert(0, current.name)
+            path.append(current.name)
             current = current.parent
-        return ' > '.join(path)
+        return ' > '.join(reversed(path))
 
 
 class Snippet(Base):
@@ -1,34 +1,56 @@
 """Configuration management using Pydantic for type safety."""
 
-import json
+import functools
+import hashlib
 import os
 from pathlib import Path
-from typing import Optional, Dict, Any
-from pydantic import BaseModel, Field, validator
+from typing import Optional, Dict, Any, Literal, Type
+import orjson
+from pydantic import BaseModel, ConfigDict, Field
+
+
+# Key under which save_config stores the checksum of the data it wrote.
+CHECKSUM_KEY = 'checksum'
+
+
+# Schemas are built on first validation instead of at import time.
+_MODEL_CONFIG = ConfigDict(defer_build=True)
+
+
+class LocalDatabaseConfig(BaseModel):
+    """Local database configuration."""
+    model_config = _MODEL_CONFIG
+
+    path: str = Field(default='data/local.db')
+    writable: bool = True
+
+
+class SharedDatabaseConfig(BaseModel):
+    """Shared database configuration."""
+    model_config = _MODEL_CONFIG
+
+    enabled: bool = False
+    path: Optional[str] = None
+    readonly: bool = True
+    auto_sync: bool = True
+    sync_interval: int = 300  # seconds
 
 
 class DatabaseConfig(BaseModel):
     """Database configuration."""
-    mode: str = Field(default='local', description="Database mode: 'local', 'shared', or 'hybrid'")
+    model_config = _MODEL_CONFIG
 
-    class LocalConfig(BaseModel):
-        path: str = Field(default='data/local.db')
-        writable: bool = True
+    mode: Literal['local', 'shared', 'hybrid'] = Field(default='local', description="Database mode")
 
-    class SharedConfig(BaseModel):
-        enabled: bool = False
-        path: Optional[str] = None
-        readonly: bool = True
-        auto_sync: bool = True
-        sync_interval: int = 300  # seconds
-
-    local: LocalConfig = LocalConfig()
-    shared: SharedConfig = SharedConfig()
+    local: LocalDatabaseConfig = Field(default_factory=LocalDatabaseConfig)
+    shared: SharedDatabaseConfig = Field(default_factory=SharedDatabaseConfig)
 
 
 class AppearanceConfig(BaseModel):
     """UI appearance configuration."""
-    position: str = Field(default='right', description="Window position: 'right' or 'left'")
+    model_config = _MODEL_CONFIG
+
+    position: Literal['left', 'right'] = Field(default='right', description="Window position")
     offset_x: int = Field(default=10, description="Horizontal offset from screen edge")
     offset_y: int = Field(default=0, description="Vertical offset from center")
 
@@ -43,19 +65,15 @@ class AppearanceConfig(BaseModel):
     height_min: int = 400
     height_max: int = 800  # Reduced from 1200 to fit preview on screen
 
-    theme: str = Field(default='dark', description="UI theme: 'dark' or 'light'")
-
-    @validator('position')
-    def validate_position(cls, v):
-        if v not in ['left', 'right']:
-            raise ValueError("position must be 'left' or 'right'")
-        return v
+    theme: Literal['dark', 'light'] = Field(default='dark', description="UI theme")
 
 
 class HotkeyConfig(BaseModel):
     """Hotkey configuration."""
+    model_config = _MODEL_CONFIG
+
     toggle_key: str = Field(default='ctrl', description="Primary toggle key")
-    toggle_mode: str = Field(default='double_tap', description="'double_tap' or 'single'")
+    toggle_mode: Literal['double_tap', 'single'] = Field(default='double_tap', description="Toggle mode")
     double_tap_threshold: float = Field(default=0.3, ge=0.1, le=1.0, description="Double tap timeout in seconds")
 
     # Additional shortcuts
@@ -66,6 +84,8 @@ class HotkeyConfig(BaseModel):
 
 class BehaviorConfig(BaseModel):
     """Application behavior configuration."""
+    model_config = _MODEL_CONFIG
+
     auto_insert: bool = Field(default=True, description="Auto-insert snippet on selection")
     auto_minimize: bool = Field(default=True, description="Auto-minimize after insertion")
     minimize_delay: int = Field(default=500, description="Delay before minimizing (ms)")
@@ -79,6 +99,8 @@ class BehaviorConfig(BaseModel):
 
 class SearchConfig(BaseModel):
     """Search configuration."""
+    model_config = _MODEL_CONFIG
+
     fuzzy_enabled: bool = Field(default=True)
     fuzzy_threshold: int = Field(default=70, ge=0, le=100, description="Fuzzy match threshold (0-100)")
     incremental: bool = Field(default=True, description="Search as you type")
@@ -89,24 +111,25 @@ class SearchConfig(BaseModel):
 
 class Config(BaseModel):
     """Main application configuration."""
-    version: str = Field(default='1.0.5')
+    model_config = ConfigDict(defer_build=True, validate_assignment=True)
 
-    database: DatabaseConfig = DatabaseConfig()
-    appearance: AppearanceConfig = AppearanceConfig()
-    hotkey: HotkeyConfig = HotkeyConfig()
-    behavior: BehaviorConfig = BehaviorConfig()
-    search: SearchConfig = SearchConfig()
+    version: str = Field(default='1.0.5')
 
-    class Config:
-        """Pydantic configuration."""
-        validate_assignment = True
+    database: DatabaseConfig = Field(default_factory=DatabaseConfig)
+    appearance: AppearanceConfig = Field(default_factory=AppearanceConfig)
+    hotkey: HotkeyConfig = Field(default_factory=HotkeyConfig)
+    behavior: BehaviorConfig = Field(default_factory=BehaviorConfig)
+    search: SearchConfig = Field(default_factory=SearchConfig)
 
 
+@functools.lru_cache(maxsize=1)
 def get_config_path() -> Path:
     """Get the configuration file path.
 
     On Windows: %APPDATA%/CodeSnippetManager/config.json
     On Mac/Linux: ~/.config/CodeSnippetManager/config.json
+
+    The result is cached, so the directory is only created on the first call.
     """
     if os.name == 'nt':  # Windows
         config_dir = Path(os.environ.get('APPDATA', '')) / 'CodeSnippetManager'
@@ -117,6 +140,45 @@ def get_config_path() -> Path:
     return config_dir / 'config.json'
 
 
+def _compute_checksum(data: Dict[str, Any]) -> str:
+    """Compute a stable checksum of configuration data.
+
+    Args:
+        data: Configuration dictionary (without the checksum key).
+
+    Returns:
+        str: Hex digest of the canonical JSON representation.
+    """
+    canonical = orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+    return hashlib.sha256(canonical).hexdigest()
+
+
+def _construct_model(model_cls: Type[BaseModel], data: Dict[str, Any]) -> BaseModel:
+    """Recursively build a model from trusted data without validation.
+
+    ``model_construct`` does not build nested models on its own, so nested
+    dictionaries are converted with their own field's model class first.
+
+    Args:
+        model_cls: Pydantic model class to construct.
+        data: Trusted field values (as written by save_config).
+
+    Returns:
+        BaseModel: Constructed model instance.
+    """
+    values = {}
+    for name, field in model_cls.model_fields.items():
+        if name not in data:
+            continue
+        value = data[name]
+        annotation = field.annotation
+        if (isinstance(value, dict) and isinstance(annotation, type)
+                and issubclass(annotation, BaseModel)):
+            value = _construct_model(annotation, value)
+        values[name] = value
+    return model_cls.model_construct(**values)
+
+
 def load_config(config_path: Optional[Path] = None) -> Config:
     """Load configuration from file.
 
@@ -129,16 +191,21 @@ def load_config(config_path: Optional[Path] = None) -> Config:
     if config_path is None:
         config_path = get_config_path()
 
-    if not config_path.exists():
+    try:
+        data = orjson.loads(config_path.read_bytes())
+
+        # Files written by save_config carry a checksum; skip re-validation
+        # for those and fall back to full validation after external edits.
+        checksum = data.pop(CHECKSUM_KEY, None)
+        if checksum is not None and checksum == _compute_checksum(data):
+            return _construct_model(Config, data)
+        # Validate through the class-level validator built once per process
+        return Config.model_validate(data)
+    except FileNotFoundError:
         # Create default config
         config = Config()
         save_config(config, config_path)
         return config
-
-    try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        return Config(**data)
     except Exception as e:
         print(f"Error loading config: {e}")
         print("Using default configuration.")
@@ -160,14 +227,21 @@ def save_config(config: Config, config_path: Optional[Path] = None) -> bool:
 
     try:
         config_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(config_path, 'w', encoding='utf-8') as f:
-            json.dump(config.dict(), f, indent=2, ensure_ascii=False)
+        data = config.model_dump()
+        data[CHECKSUM_KEY] = _compute_checksum(data)
+        config_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
         return True
     except Exception as e:
         print(f"Error saving config: {e}")
         return False
 
 
+# Working directory at import time; relative paths resolve against it so
+# cached expand_path results stay consistent.
+_CWD = Path.cwd()
+
+
+@functools.lru_cache(maxsize=32)
 def expand_path(path: str) -> Path:
     """Expand environment variables and convert to absolute path.
 
@@ -176,6 +250,8 @@ def expand_path(path: str) -> Path:
     - ~ for home directory
     - Relative paths (converted to absolute)
 
+    Results are cached per input string.
+
     Args:
         path: Path string with possible environment variables.
 
@@ -191,6 +267,6 @@ def expand_path(path: str) -> Path:
     # Convert to Path and make absolute
     path_obj = Path(path)
     if not path_obj.is_absolute():
-        path_obj = Path.cwd() / path_obj
+        path_obj = _CWD / path_obj
 
     return path_obj
@@ -1,11 +1,19 @@
 """Database manager with support for local and shared databases."""
 
+import functools
+import operator
 import os
+from collections import defaultdict
+from datetime import datetime
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator, Tuple
 from contextlib import contextmanager
 
-from sqlalchemy import create_engine, event, text
+from sqlalchemy import (
+    MetaData, bindparam, column, create_engine, event, func, insert, literal, select, table, text,
+    union_all, update,
+)
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
 
@@ -13,6 +21,367 @@ from models.models import Base, Tag, Snippet, TagSnippet, Session as UserSession
 from utils.config import Config, expand_path
 
 
+# Columns projected for snippet listings (no ORM entities are built)
+_SNIPPET_COLUMNS = (
+    Snippet.id,
+    Snippet.name,
+    Snippet.code,
+    Snippet.description,
+    Snippet.language,
+    Snippet.usage_count,
+    Snippet.last_used,
+)
+_SNIPPET_FIELDS = tuple(col.key for col in _SNIPPET_COLUMNS)
+_get_snippet_fields = operator.attrgetter(*_SNIPPET_FIELDS)
+
+# Connection PRAGMAs: WAL lets readers proceed during writes, the rest trade
+# strict durability and disk I/O for speed (64 MB cache, 256 MB mmap).
+_SQLITE_PRAGMAS = (
+    "PRAGMA foreign_keys=ON",
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
+
+# Subset that is safe on read-only databases
+_SQLITE_READONLY_PRAGMAS = (
+    "PRAGMA cache_size=-65536",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
+
+# FTS5 index over snippet name/description, kept in sync by triggers
+_SNIPPET_FTS = table('snippet_fts', column('rowid'), column('snippet_fts'))
+
+# The shared database is ATTACHed to every local connection under this
+# schema, so local and shared rows can be merged in a single statement.
+_SHARED_SCHEMA = 'shared'
+_shared_metadata = MetaData()
+_SHARED_SNIPPETS = Snippet.__table__.to_metadata(_shared_metadata, schema=_SHARED_SCHEMA)
+_SHARED_TAG_SNIPPETS = TagSnippet.__table__.to_metadata(_shared_metadata, schema=_SHARED_SCHEMA)
+_SHARED_SNIPPET_FTS = table(
+    'snippet_fts', column('rowid'), column('snippet_fts'), schema=_SHARED_SCHEMA
+)
+_SHARED_SNIPPET_COLUMNS = tuple(_SHARED_SNIPPETS.c[name] for name in _SNIPPET_FIELDS)
+
+# The trigram tokenizer (SQLite >= 3.34) matches any substring of 3+
+# characters, like the LIKE '%q%' scan it replaces. This includes words
+# inside Japanese text, which has no spaces to split tokens on.
+_FTS_TOKENIZER = 'trigram'
+_FTS_MIN_QUERY = 3  # Shorter queries have no trigram and use LIKE
+
+_FTS_CREATE = (
+    "CREATE VIRTUAL TABLE snippet_fts USING fts5("
+    f"name, description, content='snippets', content_rowid='id', tokenize='{_FTS_TOKENIZER}')"
+)
+
+_FTS_TRIGGERS = (
+    """CREATE TRIGGER IF NOT EXISTS snippet_fts_ai AFTER INSERT ON snippets BEGIN
+        INSERT INTO snippet_fts(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS snippet_fts_ad AFTER DELETE ON snippets BEGIN
+        INSERT INTO snippet_fts(snippet_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS snippet_fts_au AFTER UPDATE OF name, description ON snippets BEGIN
+        INSERT INTO snippet_fts(snippet_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO snippet_fts(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END""",
+)
+
+
+# Not slotted: dataclass(slots=True) needs Python 3.10, and there is only
+# one instance per result set
+@dataclass
+class SnippetTable:
+    """Column-oriented snippet results.
+
+    Stores one list per field instead of one dict per snippet, which keeps
+    large result sets compact and makes single-column scans cheap.
+    ``table[i]`` returns the row as a dict for code that needs one.
+    """
+    ids: List[int] = field(default_factory=list)
+    names: List[str] = field(default_factory=list)
+    codes: List[str] = field(default_factory=list)
+    descriptions: List[Optional[str]] = field(default_factory=list)
+    languages: List[Optional[str]] = field(default_factory=list)
+    usage_counts: List[int] = field(default_factory=list)
+    last_used: List[Any] = field(default_factory=list)
+    sources: List[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        return {
+            'id': self.ids[index],
+            'name': self.names[index],
+            'code': self.codes[index],
+            'description': self.descriptions[index],
+            'language': self.languages[index],
+            'usage_count': self.usage_counts[index],
+            'last_used': self.last_used[index],
+            'source': self.sources[index],
+        }
+
+    def extend(self, rows, source: str):
+        """Append result rows (in _SNIPPET_COLUMNS order) to the columns.
+
+        Args:
+            rows: Sequence of result rows.
+            source: 'local' or 'shared'.
+        """
+        rows = list(rows)
+        if not rows:
+            return
+        ids, names, codes, descriptions, languages, usage_counts, last_used = zip(*rows)
+        self.ids.extend(ids)
+        self.names.extend(names)
+        self.codes.extend(codes)
+        self.descriptions.extend(descriptions)
+        self.languages.extend(languages)
+        self.usage_counts.extend(usage_counts)
+        self.last_used.extend(last_used)
+        self.sources.extend([source] * len(rows))
+
+
+def _snippet_to_dict(snippet, source: str) -> Dict[str, Any]:
+    """Convert a snippet row (or ORM instance) to a dictionary.
+
+    Args:
+        snippet: Object exposing the _SNIPPET_FIELDS attributes.
+        source: 'local' or 'shared'.
+
+    Returns:
+        Dict: Snippet as dictionary.
+    """
+    return dict(zip(_SNIPPET_FIELDS, _get_snippet_fields(snippet)), source=source)
+
+
+def _union_sources(local_stmt, shared_stmt):
+    """Combine local and attached shared statements with UNION ALL.
+
+    Both statements must select the same columns. A ``source`` column is
+    added to each side so rows can be told apart after the merge.
+
+    Args:
+        local_stmt: Select against the local tables.
+        shared_stmt: Select against the attached shared tables.
+
+    Returns:
+        CompoundSelect: Unordered UNION ALL of both statements.
+    """
+    return union_all(
+        local_stmt.add_columns(literal('local').label('source')),
+        shared_stmt.add_columns(literal('shared').label('source')),
+    )
+
+
+def _fts_match_expression(query: str) -> str:
+    """Convert free text into an FTS5 MATCH expression.
+
+    The whole query is quoted as one string (so FTS operators and
+    punctuation are taken literally). With the trigram tokenizer this
+    matches it as a case-insensitive substring, as LIKE '%query%' does.
+
+    Args:
+        query: Raw search text.
+
+    Returns:
+        str: MATCH expression, or an empty string if the query is too short
+        for the trigram index.
+    """
+    if len(query) < _FTS_MIN_QUERY:
+        return ''
+    return '"' + query.replace('"', '""') + '"'
+
+
+def _readonly_uri(path: Path) -> str:
+    """Build a SQLite URI that opens a database file read-only.
+
+    Args:
+        path: Database file path.
+
+    Returns:
+        str: ``file:`` URI with ``mode=ro``.
+    """
+    return f"{path.resolve().as_uri()}?mode=ro"
+
+
+def _escape_like(value: str) -> str:
+    """Escape LIKE wildcards so the value is matched literally."""
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+# Read statements are built once at import time. Per-call values are bound
+# parameters, so executions skip statement construction and cache-key
+# generation and go straight to the compiled SQL cache.
+
+# Every tag's full path in one query (recursive CTE) instead of lazy-loading
+# each ancestor through Tag.parent
+_tag_paths = (
+    select(Tag.id, Tag.name.label('path'))
+    .where(Tag.parent_id.is_(None))
+    .cte('tag_paths', recursive=True)
+)
+_tag_paths = _tag_paths.union_all(
+    select(Tag.id, (_tag_paths.c.path + ' > ' + Tag.name).label('path'))
+    .join(_tag_paths, Tag.parent_id == _tag_paths.c.id)
+)
+_ALL_TAGS = (
+    select(
+        Tag.id, Tag.name, Tag.parent_id, Tag.type, Tag.icon,
+        Tag.color, Tag.description,
+        func.coalesce(_tag_paths.c.path, Tag.name).label('full_path'),
+    )
+    .outerjoin(_tag_paths, _tag_paths.c.id == Tag.id)
+    .order_by(Tag.order, Tag.name)
+)
+
+_ALL_SNIPPETS = select(*_SNIPPET_COLUMNS).order_by(Snippet.name)
+_ALL_SNIPPETS_MERGED = _union_sources(select(*_SNIPPET_COLUMNS), select(*_SHARED_SNIPPET_COLUMNS))
+_ALL_SNIPPETS_MERGED = _ALL_SNIPPETS_MERGED.order_by(
+    _ALL_SNIPPETS_MERGED.selected_columns.source, _ALL_SNIPPETS_MERGED.selected_columns.name
+)
+
+_SNIPPETS_BY_TAG = (
+    select(*_SNIPPET_COLUMNS)
+    .join(TagSnippet, TagSnippet.snippet_id == Snippet.id)
+    .where(TagSnippet.tag_id == bindparam('tag_id'))
+)
+_SNIPPETS_BY_TAG_MERGED = _union_sources(
+    _SNIPPETS_BY_TAG,
+    select(*_SHARED_SNIPPET_COLUMNS)
+    .join(_SHARED_TAG_SNIPPETS, _SHARED_TAG_SNIPPETS.c.snippet_id == _SHARED_SNIPPETS.c.id)
+    .where(_SHARED_TAG_SNIPPETS.c.tag_id == bindparam('tag_id')),
+)
+_SNIPPETS_BY_TAG_MERGED = _SNIPPETS_BY_TAG_MERGED.order_by(
+    _SNIPPETS_BY_TAG_MERGED.selected_columns.source, _SNIPPETS_BY_TAG_MERGED.selected_columns.name
+)
+_SNIPPETS_BY_TAG = _SNIPPETS_BY_TAG.order_by(Snippet.name)
+
+# Every snippet-tag link in one join, for grouping snippets by tag
+_TAGGED_SNIPPETS = (
+    select(TagSnippet.tag_id, *_SNIPPET_COLUMNS)
+    .join(TagSnippet, TagSnippet.snippet_id == Snippet.id)
+)
+_TAGGED_SNIPPETS_MERGED = _union_sources(
+    _TAGGED_SNIPPETS,
+    select(_SHARED_TAG_SNIPPETS.c.tag_id, *_SHARED_SNIPPET_COLUMNS)
+    .join(_SHARED_TAG_SNIPPETS, _SHARED_TAG_SNIPPETS.c.snippet_id == _SHARED_SNIPPETS.c.id),
+)
+_TAGGED_SNIPPETS_MERGED = _TAGGED_SNIPPETS_MERGED.order_by(
+    _TAGGED_SNIPPETS_MERGED.selected_columns.source, _TAGGED_SNIPPETS_MERGED.selected_columns.name
+)
+_TAGGED_SNIPPETS = _TAGGED_SNIPPETS.order_by(Snippet.name)
+
+_SNIPPET_BY_ID = (
+    select(*_SNIPPET_COLUMNS, Snippet.is_favorite)
+    .where(Snippet.id == bindparam('snippet_id'))
+)
+
+# Add uses to one snippet (add_usage_counts runs it once per snippet)
+_ADD_USAGE = (
+    update(Snippet.__table__)
+    .where(Snippet.__table__.c.id == bindparam('snippet_id'))
+    .values(
+        usage_count=Snippet.__table__.c.usage_count + bindparam('delta'),
+        last_used=bindparam('used_at'),
+    )
+)
+
+_FAVORITE_SNIPPETS = (
+    select(*_SNIPPET_COLUMNS, Snippet.is_favorite, Snippet.source)
+    .where(Snippet.is_favorite == True)
+    .order_by(Snippet.usage_count.desc(), Snippet.name)
+)
+
+
+def _search_kind(query: str, use_fts: bool) -> Optional[str]:
+    """Pick the search filter for a query.
+
+    Args:
+        query: Search query string.
+        use_fts: Whether the target database has the FTS index.
+
+    Returns:
+        str: 'fts' for an FTS5 MATCH, 'like' for a LIKE scan, or None
+        when there is nothing to filter on.
+    """
+    if use_fts and _fts_match_expression(query):
+        return 'fts'
+    if query:
+        return 'like'
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def _search_statement(kind: Optional[str], filter_language: bool, shared: bool = False):
+    """Build the (unordered) snippet search statement.
+
+    Uses the FTS5 index for kind 'fts' and otherwise a LIKE scan with
+    escaped wildcards. Search values are bound as the ``match``, ``pattern``
+    and ``language`` parameters, so only a handful of statement shapes
+    exist and each is built once.
+
+    Args:
+        kind: Filter from _search_kind().
+        filter_language: Whether to filter on the ``language`` parameter.
+        shared: Whether to search the attached shared tables.
+
+    Returns:
+        Select: Statement yielding snippet columns.
+    """
+    if shared:
+        snippets, fts = _SHARED_SNIPPETS, _SHARED_SNIPPET_FTS
+    else:
+        snippets, fts = Snippet.__table__, _SNIPPET_FTS
+
+    stmt = select(*(snippets.c[name] for name in _SNIPPET_FIELDS))
+
+    if kind == 'fts':
+        stmt = stmt.join(fts, fts.c.rowid == snippets.c.id).where(
+            fts.c.snippet_fts.op('MATCH')(bindparam('match'))
+        )
+    elif kind == 'like':
+        pattern = bindparam('pattern')
+        stmt = stmt.where(
+            snippets.c.name.ilike(pattern, escape='\\') |
+            snippets.c.description.ilike(pattern, escape='\\')
+        )
+
+    if filter_language:
+        stmt = stmt.where(snippets.c.language == bindparam('language'))
+    return stmt
+
+
+@functools.lru_cache(maxsize=None)
+def _merged_search_statement(local_kind: Optional[str], shared_kind: Optional[str],
+                             filter_language: bool):
+    """Build the local + attached shared search, ranked by usage.
+
+    Args:
+        local_kind: Filter for the local side.
+        shared_kind: Filter for the shared side.
+        filter_language: Whether to filter on the ``language`` parameter.
+
+    Returns:
+        CompoundSelect: Ordered UNION ALL of both searches.
+    """
+    merged = _union_sources(
+        _search_statement(local_kind, filter_language),
+        _search_statement(shared_kind, filter_language, shared=True),
+    )
+    return merged.order_by(
+        merged.selected_columns.usage_count.desc(), merged.selected_columns.source
+    )
+
+
 class DatabaseManager:
     """Manages local and shared database connections.
 
@@ -33,57 +402,249 @@ class DatabaseManager:
         self.shared_engine = None
         self.LocalSession = None
         self.SharedSession = None
+        self.local_fts = False
+        self.shared_fts = False
+        self.shared_attached = False
+
+        # Result caches keyed by include_shared, valid while the stored
+        # version matches the current one. Mutations bump the tag or
+        # snippet version; writes by other connections bump
+        # _external_changes through the SQLite data_version.
+        self._tag_version = 0
+        self._snippet_version = 0
+        self._external_changes = 0
+        self._tag_cache: Dict[bool, Tuple[tuple, List[Dict[str, Any]]]] = {}
+        self._snippet_cache: Dict[bool, Tuple[tuple, List[Dict[str, Any]]]] = {}
+        # (raw connection, schemas) pairs polled for PRAGMA data_version,
+        # and the values last seen on them
+        self._version_sources: List[Tuple[Any, Tuple[str, ...]]] = []
+        self._seen_data_version: tuple = ()
 
         self._setup_databases()
 
     def _setup_databases(self):
         """Set up database engines and session makers."""
+        # Shared database path (optional, read-only)
+        shared_path = None
+        if self.config.database.shared.enabled and self.config.database.shared.path:
+            shared_path = expand_path(self.config.database.shared.path)
+            if not shared_path.exists():
+                print(f"⚠ Warning: Shared database not found: {shared_path}")
+                shared_path = None
+
         # Local database (always enabled, read-write)
-        local_path = expand_path(self.config.database.local.path)
-        local_path.parent.mkdir(parents=True, exist_ok=True)
-
-        self.local_engine = create_engine(
-            f'sqlite:///{local_path}',
-            connect_args={'check_same_thread': False},
-            poolclass=StaticPool,
-            echo=False  # Set to True for SQL debugging
-        )
+        if self.config.database.local.path == ':memory:':
+            # In-memory databases exist per connection, so share one
+            self.local_engine = create_engine(
+                'sqlite://',
+                # uri: lets ATTACH open the shared database read-only
+                connect_args={'check_same_thread': False, 'uri': True},
+                poolclass=StaticPool,
+                echo=False  # Set to True for SQL debugging
+            )
+        else:
+            local_path = expand_path(self.config.database.local.path)
+            local_path.parent.mkdir(parents=True, exist_ok=True)
+
+            # Default pooling lets reads and writes overlap under WAL
+            self.local_engine = create_engine(
+                f'sqlite:///{local_path}',
+                # uri: lets ATTACH open the shared database read-only
+                connect_args={'check_same_thread': False, 'uri': True},
+                echo=False  # Set to True for SQL debugging
+            )
 
-        # Enable foreign keys for SQLite
+        # Enable foreign keys and performance settings for SQLite
         @event.listens_for(self.local_engine, "connect")
         def set_sqlite_pragma(dbapi_conn, connection_record):
             cursor = dbapi_conn.cursor()
-            cursor.execute("PRAGMA foreign_keys=ON")
+            for pragma in _SQLITE_PRAGMAS:
+                cursor.execute(pragma)
+            if shared_path is not None:
+                # Attach the shared database so merged queries need one round
+                # trip. Opened read-only like the shared engine, so nothing
+                # run on the local connection can write to the team database.
+                try:
+                    cursor.execute(f"ATTACH DATABASE ? AS {_SHARED_SCHEMA}", (_readonly_uri(shared_path),))
+                except Exception as e:
+                    print(f"⚠ Warning: Could not attach shared database: {e}")
             cursor.close()
 
         self.LocalSession = sessionmaker(bind=self.local_engine)
 
         # Create tables if they don't exist
         Base.metadata.create_all(self.local_engine)
+        self.local_fts = self._setup_fts(self.local_engine)
 
         # Shared database (optional, read-only)
-        if self.config.database.shared.enabled and self.config.database.shared.path:
-            shared_path = expand_path(self.config.database.shared.path)
+        if shared_path is not None:
+            self.shared_attached = self._is_attached(self.local_engine, _SHARED_SCHEMA)
+            try:
+                self.shared_engine = create_engine(
+                    f'sqlite:///{_readonly_uri(shared_path)}&uri=true',  # Read-only mode
+                    connect_args={'check_same_thread': False},
+                    echo=False
+                )
+
+                @event.listens_for(self.shared_engine, "connect")
+                def set_shared_pragma(dbapi_conn, connection_record):
+                    cursor = dbapi_conn.cursor()
+                    for pragma in _SQLITE_READONLY_PRAGMAS:
+                        cursor.execute(pragma)
+                    cursor.close()
+
+                self.SharedSession = sessionmaker(bind=self.shared_engine)
+                if self.shared_attached:
+                    self.shared_fts = self._has_fts(self.local_engine, _SHARED_SCHEMA)
+                else:
+                    self.shared_fts = self._has_fts(self.shared_engine)
+                print(f"✓ Shared database connected: {shared_path}")
+            except Exception as e:
+                print(f"⚠ Warning: Could not connect to shared database: {e}")
+                self.shared_engine = None
+
+        self._setup_change_detection()
+
+    def _setup_change_detection(self):
+        """Open the connections used to notice writes made outside this manager.
+
+        PRAGMA data_version changes whenever another connection, in this or
+        another process, commits to the database. These connections never
+        write, so every commit elsewhere shows up on them. This covers, for
+        example, teammates updating the shared database and
+        import_snippets.py running while the app is open.
+        """
+        schemas = ('main', _SHARED_SCHEMA) if self.shared_attached else ('main',)
+        self._version_sources.append((self.local_engine.raw_connection(), schemas))
 
-            if shared_path.exists():
-                try:
-                    self.shared_engine = create_engine(
-                        f'sqlite:///{shared_path}',
-                        connect_args={
-                            'check_same_thread': False,
-                            'uri': True,
-                            'mode': 'ro'  # Read-only mode
-                        },
-                        poolclass=StaticPool,
-                        echo=False
-                    )
-                    self.SharedSession = sessionmaker(bind=self.shared_engine)
-                    print(f"✓ Shared database connected: {shared_path}")
-                except Exception as e:
-                    print(f"⚠ Warning: Could not connect to shared database: {e}")
-                    self.shared_engine = None
-            else:
-                print(f"⚠ Warning: Shared database not found: {shared_path}")
+        if self.shared_engine is not None and not self.shared_attached:
+            try:
+                self._version_sources.append((self.shared_engine.raw_connection(), ('main',)))
+            except Exception as e:
+                print(f"⚠ Warning: Cannot watch shared database for changes: {e}")
+
+        self._seen_data_version = self._data_version()
+
+    def _data_version(self) -> tuple:
+        """Get the data_version of every database the cached lists read.
+
+        Returns:
+            tuple: One value per database; changes after outside commits.
+        """
+        versions = []
+        for conn, schemas in self._version_sources:
+            cursor = conn.cursor()
+            try:
+                for schema in schemas:
+                    versions.append(cursor.execute(f"PRAGMA {schema}.data_version").fetchone()[0])
+            finally:
+                cursor.close()
+        return tuple(versions)
+
+    def _external_version(self) -> int:
+        """Get a counter of the outside commits noticed so far.
+
+        Returns:
+            int: Number of times data_version was seen to change other
+            than through this manager's own writes.
+        """
+        current = self._data_version()
+        if current != self._seen_data_version:
+            self._seen_data_version = current
+            self._external_changes += 1
+        return self._external_changes
+
+    def invalidate_cache(self):
+        """Invalidate cached tag and snippet lists.
+
+        Commits by other connections, including raw sessions from
+        get_local_session(), are picked up through data_version. This is
+        only needed for in-memory databases, where every session shares
+        the connection that data_version is read from.
+        """
+        self._tag_version += 1
+        self._snippet_version += 1
+
+    @staticmethod
+    def _fts_definition(engine, schema: str = 'main') -> Optional[str]:
+        """Get the CREATE statement of the snippet FTS index in a database.
+
+        Args:
+            engine: SQLAlchemy engine to inspect.
+            schema: Database name on the connection ('main' or an attached one).
+
+        Returns:
+            str: The table's SQL, or None if there is no snippet_fts table.
+        """
+        try:
+            with engine.connect() as conn:
+                return conn.execute(text(
+                    f"SELECT sql FROM {schema}.sqlite_master "
+                    "WHERE type = 'table' AND name = 'snippet_fts'"
+                )).scalar()
+        except Exception:
+            return None
+
+    @classmethod
+    def _has_fts(cls, engine, schema: str = 'main') -> bool:
+        """Check whether a database has a usable (trigram) snippet FTS index.
+
+        Indexes built with another tokenizer match differently from the
+        LIKE fallback and are not used.
+
+        Args:
+            engine: SQLAlchemy engine to inspect.
+            schema: Database name on the connection ('main' or an attached one).
+
+        Returns:
+            bool: True if snippet_fts exists and uses the trigram tokenizer.
+        """
+        definition = cls._fts_definition(engine, schema)
+        return definition is not None and _FTS_TOKENIZER in definition
+
+    @staticmethod
+    def _is_attached(engine, schema: str) -> bool:
+        """Check whether a database is attached to the engine's connections.
+
+        Args:
+            engine: SQLAlchemy engine to inspect.
+            schema: Attached database name.
+
+        Returns:
+            bool: True if the database is attached.
+        """
+        try:
+            with engine.connect() as conn:
+                return any(row[1] == schema for row in conn.exec_driver_sql("PRAGMA database_list"))
+        except Exception:
+            return False
+
+    def _setup_fts(self, engine) -> bool:
+        """Create the snippet FTS index and its sync triggers if missing.
+
+        Args:
+            engine: SQLAlchemy engine for a writable database.
+
+        Returns:
+            bool: True if full-text search is available.
+        """
+        try:
+            definition = self._fts_definition(engine)
+            created = definition is None or _FTS_TOKENIZER not in definition
+            with engine.begin() as conn:
+                if created:
+                    if definition is not None:
+                        # Index from an older version with another tokenizer
+                        conn.execute(text("DROP TABLE snippet_fts"))
+                    conn.execute(text(_FTS_CREATE))
+                    # Index snippets that existed before the FTS table
+                    conn.execute(text("INSERT INTO snippet_fts(snippet_fts) VALUES ('rebuild')"))
+                for trigger in _FTS_TRIGGERS:
+                    conn.execute(text(trigger))
+            return True
+        except Exception as e:
+            print(f"⚠ Warning: Full-text search unavailable: {e}")
+            return False
 
     @contextmanager
     def get_local_session(self) -> Session:
@@ -102,6 +663,38 @@ class DatabaseManager:
         finally:
             session.close()
 
+    @contextmanager
+    def _write_session(self) -> Session:
+        """Get a local session for this manager's own writes.
+
+        Outside commits made before the write are counted first. The
+        data_version reached by the write is then recorded as seen, so
+        adding a snippet does not also throw away the cached tags.
+
+        Yields:
+            Session: SQLAlchemy session for local database.
+        """
+        self._external_version()
+        with self.get_local_session() as session:
+            yield session
+        self._seen_data_version = self._data_version()
+
+    @contextmanager
+    def get_local_readonly_session(self) -> Session:
+        """Get a local database session for read-only queries.
+
+        Unlike get_local_session, nothing is committed on exit; the session
+        is simply closed.
+
+        Yields:
+            Session: SQLAlchemy session for local database.
+        """
+        session = self.LocalSession()
+        try:
+            yield session
+        finally:
+            session.close()
+
     @contextmanager
     def get_shared_session(self) -> Optional[Session]:
         """Get a shared database session (context manager).
@@ -126,60 +719,29 @@ class DatabaseManager:
             include_shared: Whether to include tags from shared database.
 
         Returns:
-            List[Dict]: Combined list of tags as dictionaries.
+            List[Dict]: Combined list of tags as dictionaries. The list is
+            cached and shared between calls, so callers must not modify it.
         """
+        version = (self._tag_version, self._external_version())
+        cached = self._tag_cache.get(include_shared)
+        if cached and cached[0] == version:
+            return cached[1]
+
         tags = []
 
         # Local tags
-        with self.get_local_session() as session:
-            local_tags = session.query(Tag).order_by(Tag.order, Tag.name).all()
-            for tag in local_tags:
-                # Build path
-                path = [tag.name]
-                current = tag.parent
-                while current:
-                    path.insert(0, current.name)
-                    current = current.parent
-                full_path = ' > '.join(path)
-
-                tags.append({
-                    'id': tag.id,
-                    'name': tag.name,
-                    'parent_id': tag.parent_id,
-                    'type': tag.type,
-                    'icon': tag.icon,
-                    'color': tag.color,
-                    'description': tag.description,
-                    'full_path': full_path,
-                    'source': 'local'
-                })
+        with self.get_local_readonly_session() as session:
+            for row in session.execute(_ALL_TAGS).mappings():
+                tags.append({**row, 'source': 'local'})
 
         # Shared tags (if enabled)
         if include_shared and self.config.database.mode in ['shared', 'hybrid']:
             with self.get_shared_session() as session:
                 if session:
-                    shared_tags = session.query(Tag).order_by(Tag.order, Tag.name).all()
-                    for tag in shared_tags:
-                        # Build path
-                        path = [tag.name]
-                        current = tag.parent
-                        while current:
-                            path.insert(0, current.name)
-                            current = current.parent
-                        full_path = ' > '.join(path)
-
-                        tags.append({
-                            'id': tag.id,
-                            'name': tag.name,
-                            'parent_id': tag.parent_id,
-                            'type': tag.type,
-                            'icon': tag.icon,
-                            'color': tag.color,
-                            'description': tag.description,
-                            'full_path': full_path,
-                            'source': 'shared'
-                        })
+                    for row in session.execute(_ALL_TAGS).mappings():
+                        tags.append({**row, 'source': 'shared'})
 
+        self._tag_cache[include_shared] = (version, tags)
         return tags
 
     def get_tag_by_id(self, tag_id: int, include_shared: bool = True) -> Optional[Dict[str, Any]]:
@@ -193,7 +755,7 @@ class DatabaseManager:
             Optional[Dict]: Tag as dictionary, or None if not found.
         """
         # Try local database first
-        with self.get_local_session() as session:
+        with self.get_local_readonly_session() as session:
             tag = session.query(Tag).filter(Tag.id == tag_id).first()
             if tag:
                 return {
@@ -231,53 +793,64 @@ class DatabaseManager:
             List[Dict]: List of snippets as dictionaries.
         """
         snippets = []
+        params = {'tag_id': tag_id}
+
+        # Local and attached shared snippets in one UNION ALL
+        if include_shared and self.shared_attached and self.config.database.mode in ['shared', 'hybrid']:
+            with self.get_local_readonly_session() as session:
+                rows = session.execute(_SNIPPETS_BY_TAG_MERGED, params)
+                return [_snippet_to_dict(row, row.source) for row in rows]
 
         # Local snippets
-        with self.get_local_session() as session:
-            local_snippets = (
-                session.query(Snippet)
-                .join(TagSnippet)
-                .filter(TagSnippet.tag_id == tag_id)
-                .order_by(Snippet.name)
-                .all()
-            )
-            for snippet in local_snippets:
-                snippets.append({
-                    'id': snippet.id,
-                    'name': snippet.name,
-                    'code': snippet.code,
-                    'description': snippet.description,
-                    'language': snippet.language,
-                    'usage_count': snippet.usage_count,
-                    'last_used': snippet.last_used,
-                    'source': 'local'
-                })
+        with self.get_local_readonly_session() as session:
+            rows = session.execute(_SNIPPETS_BY_TAG, params)
+            snippets.extend(_snippet_to_dict(row, 'local') for row in rows)
 
         # Shared snippets (if enabled)
         if include_shared and self.config.database.mode in ['shared', 'hybrid']:
             with self.get_shared_session() as session:
                 if session:
-                    shared_snippets = (
-                        session.query(Snippet)
-                        .join(TagSnippet)
-                        .filter(TagSnippet.tag_id == tag_id)
-                        .order_by(Snippet.name)
-                        .all()
-                    )
-                    for snippet in shared_snippets:
-                        snippets.append({
-                            'id': snippet.id,
-                            'name': snippet.name,
-                            'code': snippet.code,
-                            'description': snippet.description,
-                            'language': snippet.language,
-                            'usage_count': snippet.usage_count,
-                            'last_used': snippet.last_used,
-                            'source': 'shared'
-                        })
+                    rows = session.execute(_SNIPPETS_BY_TAG, params)
+                    snippets.extend(_snippet_to_dict(row, 'shared') for row in rows)
 
         return snippets
 
+    def get_snippets_grouped_by_tag(self, include_shared: bool = True) -> Dict[int, List[Dict[str, Any]]]:
+        """Get the snippets of every tag in a single query.
+
+        Equivalent to calling get_snippets_by_tag for each tag, without a
+        query per tag.
+
+        Args:
+            include_shared: Whether to include snippets from shared database.
+
+        Returns:
+            Dict[int, List[Dict]]: Snippets keyed by tag ID, in the same order
+            as get_snippets_by_tag. Tags without snippets are absent.
+        """
+        grouped = defaultdict(list)
+
+        # Local and attached shared snippets in one UNION ALL
+        if include_shared and self.shared_attached and self.config.database.mode in ['shared', 'hybrid']:
+            with self.get_local_readonly_session() as session:
+                for row in session.execute(_TAGGED_SNIPPETS_MERGED):
+                    grouped[row.tag_id].append(_snippet_to_dict(row, row.source))
+            return dict(grouped)
+
+        # Local snippets
+        with self.get_local_readonly_session() as session:
+            for row in session.execute(_TAGGED_SNIPPETS):
+                grouped[row.tag_id].append(_snippet_to_dict(row, 'local'))
+
+        # Shared snippets (if enabled)
+        if include_shared and self.config.database.mode in ['shared', 'hybrid']:
+            with self.get_shared_session() as session:
+                if session:
+                    for row in session.execute(_TAGGED_SNIPPETS):
+                        grouped[row.tag_id].append(_snippet_to_dict(row, 'shared'))
+
+        return dict(grouped)
+
     def get_all_snippets(self, include_shared: bool = True) -> List[Dict[str, Any]]:
         """Get all snippets from all tags.
 
@@ -285,43 +858,80 @@ class DatabaseManager:
             include_shared: Whether to include snippets from shared database.
 
         Returns:
-            List[Dict]: List of all snippets as dictionaries.
+            List[Dict]: List of all snippets as dictionaries. The list is
+            cached and shared between calls, so callers must not modify it.
         """
-        snippets = []
+        version = (self._snippet_version, self._external_version())
+        cached = self._snippet_cache.get(include_shared)
+        if cached and cached[0] == version:
+            return cached[1]
+
+        snippets = list(self.iter_all_snippets(include_shared))
+        self._snippet_cache[include_shared] = (version, snippets)
+        return snippets
+
+    def get_snippet_table(self, include_shared: bool = True) -> SnippetTable:
+        """Get all snippets in column-oriented form.
+
+        Args:
+            include_shared: Whether to include snippets from shared database.
+
+        Returns:
+            SnippetTable: All snippets ordered by name.
+        """
+        table = SnippetTable()
 
         # Local snippets
-        with self.get_local_session() as session:
-            local_snippets = session.query(Snippet).order_by(Snippet.name).all()
-            for snippet in local_snippets:
-                snippets.append({
-                    'id': snippet.id,
-                    'name': snippet.name,
-                    'code': snippet.code,
-                    'description': snippet.description,
-                    'language': snippet.language,
-                    'usage_count': snippet.usage_count,
-                    'last_used': snippet.last_used,
-                    'source': 'local'
-                })
+        with self.get_local_readonly_session() as session:
+            table.extend(session.execute(_ALL_SNIPPETS), 'local')
 
         # Shared snippets (if enabled)
         if include_shared and self.config.database.mode in ['shared', 'hybrid']:
             with self.get_shared_session() as session:
                 if session:
-                    shared_snippets = session.query(Snippet).order_by(Snippet.name).all()
-                    for snippet in shared_snippets:
-                        snippets.append({
-                            'id': snippet.id,
-                            'name': snippet.name,
-                            'code': snippet.code,
-                            'description': snippet.description,
-                            'language': snippet.language,
-                            'usage_count': snippet.usage_count,
-                            'last_used': snippet.last_used,
-                            'source': 'shared'
-                        })
+                    table.extend(session.execute(_ALL_SNIPPETS), 'shared')
 
-        return snippets
+        return table
+
+    def iter_all_snippets(self, include_shared: bool = True,
+                          batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """Stream all snippets without materializing the full result.
+
+        Rows are fetched from SQLite in batches of ``batch_size``, so memory
+        stays bounded and the first snippets are available immediately.
+
+        Args:
+            include_shared: Whether to include snippets from shared database.
+            batch_size: Number of rows fetched per round trip.
+
+        Yields:
+            Dict: Snippet as dictionary.
+        """
+        options = {'yield_per': batch_size}
+
+        # Local and attached shared snippets in one UNION ALL
+        if include_shared and self.shared_attached and self.config.database.mode in ['shared', 'hybrid']:
+            with self.get_local_readonly_session() as session:
+                result = session.execute(_ALL_SNIPPETS_MERGED, execution_options=options)
+                for partition in result.partitions():
+                    for row in partition:
+                        yield _snippet_to_dict(row, row.source)
+            return
+
+        # Local snippets
+        with self.get_local_readonly_session() as session:
+            for partition in session.execute(_ALL_SNIPPETS, execution_options=options).partitions():
+                for row in partition:
+                    yield _snippet_to_dict(row, 'local')
+
+        # Shared snippets (if enabled)
+        if include_shared and self.config.database.mode in ['shared', 'hybrid']:
+            with self.get_shared_session() as session:
+                if session:
+                    result = session.execute(_ALL_SNIPPETS, execution_options=options)
+                    for partition in result.partitions():
+                        for row in partition:
+                            yield _snippet_to_dict(row, 'shared')
 
     def get_snippet_by_id(self, snippet_id: int, include_shared: bool = True) -> Optional[Dict[str, Any]]:
         """Get a specific snippet by ID.
@@ -333,103 +943,72 @@ class DatabaseManager:
         Returns:
             Optional[Dict]: Snippet as dictionary, or None if not found.
         """
+        params = {'snippet_id': snippet_id}
+
         # Try local database first
-        with self.get_local_session() as session:
-            snippet = session.query(Snippet).filter(Snippet.id == snippet_id).first()
-            if snippet:
-                return {
-                    'id': snippet.id,
-                    'name': snippet.name,
-                    'code': snippet.code,
-                    'description': snippet.description,
-                    'language': snippet.language,
-                    'usage_count': snippet.usage_count,
-                    'last_used': snippet.last_used,
-                    'is_favorite': snippet.is_favorite,
-                    'source': 'local'
-                }
+        with self.get_local_readonly_session() as session:
+            row = session.execute(_SNIPPET_BY_ID, params).first()
+            if row:
+                return dict(_snippet_to_dict(row, 'local'), is_favorite=row.is_favorite)
 
         # Try shared database if enabled
         if include_shared and self.config.database.mode in ['shared', 'hybrid']:
             with self.get_shared_session() as session:
                 if session:
-                    snippet = session.query(Snippet).filter(Snippet.id == snippet_id).first()
-                    if snippet:
-                        return {
-                            'id': snippet.id,
-                            'name': snippet.name,
-                            'code': snippet.code,
-                            'description': snippet.description,
-                            'language': snippet.language,
-                            'usage_count': snippet.usage_count,
-                            'last_used': snippet.last_used,
-                            'is_favorite': snippet.is_favorite,
-                            'source': 'shared'
-                        }
+                    row = session.execute(_SNIPPET_BY_ID, params).first()
+                    if row:
+                        return dict(_snippet_to_dict(row, 'shared'), is_favorite=row.is_favorite)
 
         return None
 
     def search_snippets(self, query: str, language: Optional[str] = None,
-                       include_shared: bool = True) -> List[Dict[str, Any]]:
+                       include_shared: bool = True,
+                       limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """Search snippets by text query.
 
         Args:
             query: Search query string.
             language: Optional language filter.
             include_shared: Whether to include snippets from shared database.
+            limit: Optional maximum number of results.
 
         Returns:
             List[Dict]: Matching snippets as dictionaries.
         """
+        params = {
+            'match': _fts_match_expression(query),
+            'pattern': f'%{_escape_like(query)}%',
+            'language': language,
+        }
+        filter_language = bool(language)
+        local_kind = _search_kind(query, self.local_fts)
+
+        # Search both databases in one UNION ALL, ranked by usage in SQLite
+        if include_shared and self.shared_attached and self.config.database.mode in ['shared', 'hybrid']:
+            stmt = _merged_search_statement(
+                local_kind, _search_kind(query, self.shared_fts), filter_language
+            )
+            with self.get_local_readonly_session() as session:
+                rows = session.execute(stmt.limit(limit), params)
+                return [_snippet_to_dict(row, row.source) for row in rows]
+
         results = []
 
         # Search local database
-        with self.get_local_session() as session:
-            q = session.query(Snippet).filter(
-                (Snippet.name.ilike(f'%{query}%')) |
-                (Snippet.description.ilike(f'%{query}%'))
-            )
-            if language:
-                q = q.filter(Snippet.language == language)
-
-            local_results = q.order_by(Snippet.usage_count.desc()).all()
-            for snippet in local_results:
-                results.append({
-                    'id': snippet.id,
-                    'name': snippet.name,
-                    'code': snippet.code,
-                    'description': snippet.description,
-                    'language': snippet.language,
-                    'usage_count': snippet.usage_count,
-                    'last_used': snippet.last_used,
-                    'source': 'local'
-                })
+        with self.get_local_readonly_session() as session:
+            stmt = _search_statement(local_kind, filter_language)
+            stmt = stmt.order_by(Snippet.usage_count.desc()).limit(limit)
+            results.extend(_snippet_to_dict(row, 'local') for row in session.execute(stmt, params))
 
         # Search shared database
         if include_shared and self.config.database.mode in ['shared', 'hybrid']:
             with self.get_shared_session() as session:
                 if session:
-                    q = session.query(Snippet).filter(
-                        (Snippet.name.ilike(f'%{query}%')) |
-                        (Snippet.description.ilike(f'%{query}%'))
-                    )
-                    if language:
-                        q = q.filter(Snippet.language == language)
-
-                    shared_results = q.order_by(Snippet.usage_count.desc()).all()
-                    for snippet in shared_results:
-                        results.append({
-                            'id': snippet.id,
-                            'name': snippet.name,
-                            'code': snippet.code,
-                            'description': snippet.description,
-                            'language': snippet.language,
-                            'usage_count': snippet.usage_count,
-                            'last_used': snippet.last_used,
-                            'source': 'shared'
-                        })
+                    stmt = _search_statement(_search_kind(query, self.shared_fts), filter_language)
+                    stmt = stmt.order_by(Snippet.usage_count.desc()).limit(limit)
+                    results.extend(_snippet_to_dict(row, 'shared') for row in session.execute(stmt, params))
 
-        return results
+        return results[:limit]
 
     def add_snippet(self, name: str, code: str, language: Optional[str] = None,
                    description: Optional[str] = None, tag_ids: Optional[List[int]] = None) -> int:
@@ -445,7 +1024,7 @@ class DatabaseManager:
         Returns:
             int: Created snippet ID.
         """
-        with self.get_local_session() as session:
+        with self._write_session() as session:
             snippet = Snippet(
                 name=name,
                 code=code,
@@ -458,13 +1037,15 @@ class DatabaseManager:
 
             snippet_id = snippet.id  # Store ID before session closes
 
-            # Associate with tags
+            # Associate with tags (single executemany, no ORM objects)
             if tag_ids:
-                for tag_id in tag_ids:
-                    tag_snippet = TagSnippet(tag_id=tag_id, snippet_id=snippet_id)
-                    session.add(tag_snippet)
+                session.execute(
+                    insert(TagSnippet),
+                    [{'tag_id': tag_id, 'snippet_id': snippet_id} for tag_id in tag_ids]
+                )
 
             session.commit()
+            self._snippet_version += 1
             return snippet_id
 
     def update_snippet(self, snippet_id: int, **kwargs) -> bool:
@@ -477,7 +1058,7 @@ class DatabaseManager:
         Returns:
             bool: True if successful, False if snippet not found or is shared.
         """
-        with self.get_local_session() as session:
+        with self._write_session() as session:
             snippet = session.query(Snippet).filter(Snippet.id == snippet_id).first()
 
             if not snippet:
@@ -493,6 +1074,7 @@ class DatabaseManager:
                     setattr(snippet, key, value)
 
             session.commit()
+            self._snippet_version += 1
             return True
 
     def delete_snippet(self, snippet_id: int) -> bool:
@@ -504,7 +1086,7 @@ class DatabaseManager:
         Returns:
             bool: True if successful, False if snippet not found or is shared.
         """
-        with self.get_local_session() as session:
+        with self._write_session() as session:
             snippet = session.query(Snippet).filter(Snippet.id == snippet_id).first()
 
             if not snippet:
@@ -516,6 +1098,7 @@ class DatabaseManager:
 
             session.delete(snippet)
             session.commit()
+            self._snippet_version += 1
             return True
 
     def toggle_favorite(self, snippet_id: int) -> bool:
@@ -527,16 +1110,81 @@ class DatabaseManager:
         Returns:
             bool: New favorite status (True if now favorite, False if not).
         """
-        with self.get_local_session() as session:
-            snippet = session.query(Snippet).filter(Snippet.id == snippet_id).first()
+        stmt = (
+            update(Snippet)
+            .where(Snippet.id == snippet_id)
+            .values(is_favorite=~Snippet.is_favorite)
+            .execution_options(synchronize_session=False)
+        )
 
-            if not snippet:
+        with self._write_session() as session:
+            if self.local_engine.dialect.update_returning:
+                # Flip and read back in one statement (SQLite >= 3.35)
+                is_favorite = session.execute(
+                    stmt.returning(Snippet.is_favorite)
+                ).scalar_one_or_none()
+            else:
+                is_favorite = session.execute(
+                    select(Snippet.is_favorite).where(Snippet.id == snippet_id)
+                ).scalar_one_or_none()
+                if is_favorite is not None:
+                    session.execute(stmt)
+                    is_favorite = not is_favorite
+
+            if is_favorite is None:
+                return False
+
+            session.commit()
+            self._snippet_version += 1
+            return bool(is_favorite)
+
+    def increment_usage(self, snippet_id: int) -> bool:
+        """Increment usage statistics of a local snippet.
+
+        Args:
+            snippet_id: Snippet ID that was used.
+
+        Returns:
+            bool: True if the snippet was found and updated.
+        """
+        with self._write_session() as session:
+            # One UPDATE; no SELECT or ORM object
+            updated = session.execute(
+                _ADD_USAGE,
+                {'snippet_id': snippet_id, 'delta': 1, 'used_at': datetime.utcnow()},
+            ).rowcount
+
+            if not updated:
                 return False
 
-            # Toggle favorite status
-            snippet.is_favorite = not snippet.is_favorite
             session.commit()
-            return snippet.is_favorite
+            self._snippet_version += 1
+            return True
+
+    def add_usage_counts(self, counts: Dict[int, int]) -> int:
+        """Add batched usage counts to local snippets in one transaction.
+
+        Args:
+            counts: Mapping of snippet ID to the number of uses to add.
+
+        Returns:
+            int: Number of snippets updated.
+        """
+        if not counts:
+            return 0
+
+        used_at = datetime.utcnow()
+        params = [
+            {'snippet_id': snippet_id, 'delta': delta, 'used_at': used_at}
+            for snippet_id, delta in counts.items()
+        ]
+
+        with self._write_session() as session:
+            updated = session.execute(_ADD_USAGE, params).rowcount
+            session.commit()
+
+        self._snippet_version += 1
+        return updated
 
     def get_favorite_snippets(self) -> List[Dict[str, Any]]:
         """Get all favorite snippets.
@@ -546,26 +1194,9 @@ class DatabaseManager:
         """
         favorites = []
 
-        with self.get_local_session() as session:
-            fav_snippets = (
-                session.query(Snippet)
-                .filter(Snippet.is_favorite == True)
-                .order_by(Snippet.usage_count.desc(), Snippet.name)
-                .all()
-            )
-
-            for snippet in fav_snippets:
-                favorites.append({
-                    'id': snippet.id,
-                    'name': snippet.name,
-                    'code': snippet.code,
-                    'description': snippet.description,
-                    'language': snippet.language,
-                    'usage_count': snippet.usage_count,
-                    'last_used': snippet.last_used,
-                    'is_favorite': snippet.is_favorite,
-                    'source': snippet.source
-                })
+        with self.get_local_readonly_session() as session:
+            for row in session.execute(_FAVORITE_SNIPPETS).mappings():
+                favorites.append(dict(row))
 
         return favorites
 
@@ -581,7 +1212,7 @@ class DatabaseManager:
         Returns:
             int: Tag ID (existing or newly created).
         """
-        with self.get_local_session() as session:
+        with self._write_session() as session:
             # Try to find existing tag
             tag = session.query(Tag).filter(
                 Tag.name == name,
@@ -597,10 +1228,14 @@ class DatabaseManager:
             session.flush()  # Get the ID
             tag_id = tag.id
             session.commit()
+            self._tag_version += 1
             return tag_id
 
     def close(self):
         """Close all database connections."""
+        for conn, _ in self._version_sources:
+            conn.close()
+        self._version_sources.clear()
         if self.local_engine:
             self.local_engine.dispose()
         if self.shared_engine:
@@ -2,14 +2,43 @@
 Fuzzy search utility for code snippet matching.
 
 Provides fuzzy string matching to find snippets even with typos or
-partial matches. Uses simple character-based scoring algorithm.
+partial matches. Uses simple character-based scoring algorithm, with
+RapidFuzz (C++) computing the edit-distance ratios.
 """
 
-from typing import List, Dict, Any, Tuple
-from difflib import SequenceMatcher
+import functools
+import heapq
+import re
+from operator import itemgetter
+from typing import List, Dict, Any, Optional, Tuple, Sequence
 
+import numpy as np
+from rapidfuzz import fuzz, process
 
-def calculate_fuzzy_score(query: str, text: str, case_sensitive: bool = False) -> float:
+
+# Field weights for snippet scoring (total = 1.0)
+SNIPPET_WEIGHTS = {
+    'name': 0.4,      # Name is most important
+    'code': 0.3,      # Code content is important
+    'description': 0.2,  # Description is helpful
+    'language': 0.1,  # Language is least important
+}
+
+# Scoring order for batches: cheap fields first, so the (long) code field
+# is only scored for snippets that can still reach the threshold
+_FIELD_ORDER = ('name', 'language', 'description', 'code')
+
+# Batches smaller than this are scored on the calling thread; below it,
+# starting RapidFuzz's worker threads costs more than it saves
+_PARALLEL_MIN_TEXTS = 1000
+
+
+def calculate_fuzzy_score(
+    query: str,
+    text: str,
+    case_sensitive: bool = False,
+    min_required: float = 0.0
+) -> float:
     """
     Calculate fuzzy match score between query and text.
 
@@ -17,6 +46,9 @@ def calculate_fuzzy_score(query: str, text: str, case_sensitive: bool = False) -
         query: Search query string
         text: Text to match against
         case_sensitive: Whether to perform case-sensitive matching
+        min_required: Scores below this are not of interest; when the
+            length bound shows the ratio cannot reach it, 0.0 is returned
+            without computing the ratio
 
     Returns:
         Score between 0.0 (no match) and 1.0 (perfect match)
@@ -41,9 +73,117 @@ def calculate_fuzzy_score(query: str, text: str, case_sensitive: bool = False) -
         # Score based on how much of the text matches
         return 0.8 + (0.2 * len(query) / len(text))
 
-    # Use SequenceMatcher for fuzzy matching
-    matcher = SequenceMatcher(None, query, text)
-    return matcher.ratio()
+    # 2*M/T can never exceed 2*|q|/(|q|+|t|), e.g. a short query
+    # against a long code body
+    if 2.0 * len(query) / (len(query) + len(text)) < min_required:
+        return 0.0
+
+    # Indel normalized similarity, 2*M/T
+    return fuzz.ratio(query, text) / 100.0
+
+
+def _batch_fuzzy_scores(
+    query: str,
+    texts: Sequence[str],
+    min_required: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Vectorized calculate_fuzzy_score over many texts (case-insensitive).
+
+    Args:
+        query: Lowercased, non-empty search query
+        texts: Lowercased texts to match against
+        min_required: Optional minimum score of interest per text. Where
+            the length bound 2*|q|/(|q|+|t|) is below it, the ratio is not
+            computed and the bound is returned instead.
+
+    Returns:
+        Array of scores between 0.0 and 1.0, one per text (an upper bound
+        for texts skipped via min_required)
+    """
+    count = len(texts)
+    query_len = len(query)
+    lengths = np.fromiter((len(text) for text in texts), dtype=np.float64, count=count)
+    contains = np.fromiter((query in text for text in texts), dtype=bool, count=count)
+
+    # Substring matches (exact match included: 0.8 + 0.2 == 1.0)
+    scores = 0.8 + 0.2 * query_len / np.maximum(lengths, 1.0)
+
+    # Everything else needs the edit-distance ratio, unless its length
+    # bound already rules it out
+    pending = ~contains
+    if min_required is not None:
+        bound = 2.0 * query_len / (query_len + lengths)
+        skipped = pending & (bound < min_required - 1e-9)
+        scores[skipped] = bound[skipped]
+        pending &= ~skipped
+
+    indices = np.flatnonzero(pending)
+    if len(indices) == count:
+        pending_texts = texts
+    else:
+        pending_texts = [texts[i] for i in indices]
+    if len(indices):
+        workers = -1 if len(indices) >= _PARALLEL_MIN_TEXTS else 1
+        scores[indices] = process.cdist(
+            [query], pending_texts, scorer=fuzz.ratio, dtype=np.float64, workers=workers
+        )[0] / 100.0
+
+    scores[lengths == 0] = 0.0
+    return scores
+
+
+def _batch_snippet_scores(
+    query: str,
+    texts: Dict[str, Sequence[str]],
+    threshold: float
+) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+    """
+    Score many snippets, skipping fields that cannot change the outcome.
+
+    Fields are scored in _FIELD_ORDER. Before each field, snippets whose
+    score so far plus the weight of all remaining fields is below the
+    threshold are dropped, and their remaining field scores are set to 1.0.
+    That value is an upper bound, so their total stays below threshold.
+    For the snippets still alive, the field score each one needs is passed
+    on, so ratios that cannot get there by length alone are skipped too.
+
+    Args:
+        query: Lowercased, non-empty search query
+        texts: Lowercased texts per field (equal-length sequences)
+        threshold: Minimum total score of interest
+
+    Returns:
+        Tuple of (field -> score array, total score array). Totals are exact
+        for every snippet at or above threshold.
+    """
+    count = len(texts['name'])
+    scores = {}
+    total = np.zeros(count)
+    remaining = sum(SNIPPET_WEIGHTS.values())
+
+    for field in _FIELD_ORDER:
+        weight = SNIPPET_WEIGHTS[field]
+        alive = np.flatnonzero(total + remaining >= threshold - 1e-9)
+        remaining -= weight
+
+        # Field score needed to still reach the threshold
+        min_required = (threshold - total - remaining) / weight
+
+        if len(alive) == count:
+            field_scores = _batch_fuzzy_scores(query, texts[field], min_required)
+        else:
+            field_scores = np.ones(count)
+            if len(alive):
+                field_texts = texts[field]
+                field_scores[alive] = _batch_fuzzy_scores(
+                    query, [field_texts[i] for i in alive], min_required[alive]
+                )
+
+        scores[field] = field_scores
+        total += weight * field_scores
+
+    return scores, total
 
 
 def calculate_snippet_score(query: str, snippet: Dict[str, Any]) -> float:
@@ -63,14 +203,6 @@ def calculate_snippet_score(query: str, snippet: Dict[str, Any]) -> float:
     if not query:
         return 1.0
 
-    # Field weights (total = 1.0)
-    WEIGHTS = {
-        'name': 0.4,      # Name is most important
-        'code': 0.3,      # Code content is important
-        'description': 0.2,  # Description is helpful
-        'language': 0.1,  # Language is least important
-    }
-
     # Calculate scores for each field
     name_score = calculate_fuzzy_score(query, snippet.get('name', ''))
     code_score = calculate_fuzzy_score(query, snippet.get('code', ''))
@@ -79,10 +211,10 @@ def calculate_snippet_score(query: str, snippet: Dict[str, Any]) -> float:
 
     # Weighted combination
     total_score = (
-        name_score * WEIGHTS['name'] +
-        code_score * WEIGHTS['code'] +
-        description_score * WEIGHTS['description'] +
-        language_score * WEIGHTS['language']
+        name_score * SNIPPET_WEIGHTS['name'] +
+        code_score * SNIPPET_WEIGHTS['code'] +
+        description_score * SNIPPET_WEIGHTS['description'] +
+        language_score * SNIPPET_WEIGHTS['language']
     )
 
     return total_score
@@ -110,18 +242,165 @@ def fuzzy_search_snippets(
         # Return all snippets with score 1.0
         return [(snippet, 1.0) for snippet in snippets[:max_results]]
 
-    # Calculate scores for all snippets
-    scored_snippets = []
-    for snippet in snippets:
-        score = calculate_snippet_score(query, snippet)
-        if score >= threshold:
-            scored_snippets.append((snippet, score))
+    if not snippets:
+        return []
+
+    query = query.lower()
+
+    # Score each field for all snippets at once and blend with the weights
+    texts = {
+        field: [(snippet.get(field) or '').lower() for snippet in snippets]
+        for field in SNIPPET_WEIGHTS
+    }
+    _, total = _batch_snippet_scores(query, texts, threshold)
+
+    return _top_results(snippets, total, threshold, max_results)
+
+
+def _top_results(
+    items: Sequence[Dict[str, Any]],
+    scores: np.ndarray,
+    threshold: float,
+    max_results: int
+) -> List[Tuple[Dict[str, Any], float]]:
+    """
+    Select the best-scoring items above threshold.
+
+    Uses a partial sort, so only the selected items are fully ordered.
+    Ties keep their original order.
+
+    Args:
+        items: Items that were scored
+        scores: Score per item
+        threshold: Minimum score to include in results
+        max_results: Maximum number of results to return
+
+    Returns:
+        List of (item, score) tuples, sorted by score descending
+    """
+    indices = np.flatnonzero(scores >= threshold)
+    if len(indices) > max_results:
+        top = np.argpartition(-scores[indices], max_results - 1)[:max_results]
+        indices = np.sort(indices[top])
+    order = indices[np.argsort(-scores[indices], kind='stable')]
+
+    return [(items[i], float(scores[i])) for i in order]
 
-    # Sort by score descending
-    scored_snippets.sort(key=lambda x: x[1], reverse=True)
 
-    # Return top results
-    return scored_snippets[:max_results]
+class FuzzySearcher:
+    """
+    Incremental fuzzy snippet search for search-as-you-type.
+
+    Produces the same results as fuzzy_search_snippets, but reuses work
+    between calls:
+    - Lowercased field texts are kept while the snippet list is unchanged
+    - When the new query extends the previous one, only snippets that can
+      still reach the threshold are re-scored
+
+    Pruning is exact. Appending k characters to the query raises the
+    common-subsequence length by at most k, so a non-substring field score
+    r becomes at most (r * (|q| + |t|) + 2k) / (|q| + k + |t|). A field
+    that was not a substring match (score < 0.8) cannot become one.
+    """
+
+    def __init__(self, threshold: float = 0.3, max_results: int = 50):
+        """
+        Initialize searcher.
+
+        Args:
+            threshold: Minimum score to include in results (0.0 to 1.0)
+            max_results: Maximum number of results to return
+        """
+        self.threshold = threshold
+        self.max_results = max_results
+
+        self._snippets = None
+        self._texts: Dict[str, List[str]] = {}
+        self._lengths: Dict[str, np.ndarray] = {}
+
+        # Per-field scores for the last query (exact, or an upper bound
+        # for snippets that were pruned)
+        self._query = ''
+        self._scores: Dict[str, np.ndarray] = {}
+
+    def reset(self):
+        """Forget the previous query (the next search rescans everything)."""
+        self._query = ''
+        self._scores = {}
+
+    def _index(self, snippets: List[Dict[str, Any]]):
+        """Cache lowercased field texts for a snippet list."""
+        self._snippets = snippets
+        self._texts = {
+            field: [(snippet.get(field) or '').lower() for snippet in snippets]
+            for field in SNIPPET_WEIGHTS
+        }
+        self._lengths = {
+            field: np.fromiter((len(text) for text in texts), dtype=np.float64, count=len(texts))
+            for field, texts in self._texts.items()
+        }
+        self.reset()
+
+    def _upper_bounds(self, extra_chars: int) -> Dict[str, np.ndarray]:
+        """Bound each field score after extending the last query."""
+        query_len = len(self._query)
+        bounds = {}
+        for field, scores in self._scores.items():
+            lengths = self._lengths[field]
+            bound = (scores * (query_len + lengths) + 2 * extra_chars) / (
+                query_len + extra_chars + lengths
+            )
+            bound = np.where(scores >= 0.8, 1.0, np.minimum(bound, 1.0))
+            bound[lengths == 0] = 0.0
+            bounds[field] = bound
+        return bounds
+
+    def search(self, query: str, snippets: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Search snippets using fuzzy matching.
+
+        Args:
+            query: Search query string
+            snippets: List of snippet dictionaries (pass the same list object
+                between keystrokes to reuse the cached texts)
+
+        Returns:
+            List of (snippet, score) tuples, sorted by score descending
+        """
+        if not query:
+            self.reset()
+            return [(snippet, 1.0) for snippet in snippets[:self.max_results]]
+
+        if snippets is not self._snippets or len(snippets) != len(self._texts['name']):
+            self._index(snippets)
+
+        if not snippets:
+            return []
+
+        query = query.lower()
+        if self._query and query.startswith(self._query):
+            scores = self._upper_bounds(len(query) - len(self._query))
+            bound = sum(weight * scores[field] for field, weight in SNIPPET_WEIGHTS.items())
+            candidates = np.flatnonzero(bound >= self.threshold - 1e-9)
+        else:
+            scores = {field: np.zeros(len(snippets)) for field in SNIPPET_WEIGHTS}
+            candidates = np.arange(len(snippets))
+
+        # Score only the candidates; the rest keep their (failing) bounds
+        total = np.zeros(len(snippets))
+        if len(candidates):
+            texts = {
+                field: [field_texts[i] for i in candidates]
+                for field, field_texts in self._texts.items()
+            }
+            candidate_scores, total[candidates] = _batch_snippet_scores(query, texts, self.threshold)
+            for field, field_scores in candidate_scores.items():
+                scores[field][candidates] = field_scores
+
+        self._query = query
+        self._scores = scores
+
+        return _top_results(snippets, total, self.threshold, self.max_results)
 
 
 def calculate_tag_score(query: str, tag: Dict[str, Any]) -> float:
@@ -167,18 +446,14 @@ def fuzzy_search_tags(
     if not query:
         return [(tag, 1.0) for tag in tags[:max_results]]
 
-    # Calculate scores for all tags
-    scored_tags = []
-    for tag in tags:
-        score = calculate_tag_score(query, tag)
-        if score >= threshold:
-            scored_tags.append((tag, score))
-
-    # Sort by score descending
-    scored_tags.sort(key=lambda x: x[1], reverse=True)
-
-    # Return top results
-    return scored_tags[:max_results]
+    # Score lazily and keep only the best max_results in a heap
+    # (O(N log K), same order as a stable descending sort)
+    scored_tags = ((tag, calculate_tag_score(query, tag)) for tag in tags)
+    return heapq.nlargest(
+        max_results,
+        (scored for scored in scored_tags if scored[1] >= threshold),
+        key=itemgetter(1)
+    )
 
 
 def highlight_matches(query: str, text: str, case_sensitive: bool = False) -> List[Tuple[int, int]]:
@@ -196,19 +471,17 @@ def highlight_matches(query: str, text: str, case_sensitive: bool = False) -> Li
     if not query or not text:
         return []
 
-    # Normalize case if needed
-    search_query = query if case_sensitive else query.lower()
-    search_text = text if case_sensitive else text.lower()
+    # Find all (possibly overlapping) occurrences in a single C-level scan
+    pattern = _match_pattern(query, case_sensitive)
+    return [match.span(1) for match in pattern.finditer(text)]
 
-    matches = []
 
-    # Find all occurrences of query as substring
-    start = 0
-    while True:
-        pos = search_text.find(search_query, start)
-        if pos == -1:
-            break
-        matches.append((pos, pos + len(query)))
-        start = pos + 1
+@functools.lru_cache(maxsize=128)
+def _match_pattern(query: str, case_sensitive: bool) -> 're.Pattern':
+    """
+    Compile the literal-substring pattern used by highlight_matches.
 
-    return matches
+    The lookahead keeps overlapping occurrences ('aa' in 'aaa' -> 2 matches).
+    """
+    flags = 0 if case_sensitive else re.IGNORECASE
+    return re.compile(f'(?=({re.escape(query)}))', flags)
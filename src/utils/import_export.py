@@ -7,10 +7,12 @@ Supports:
 - Backup and restore
 """
 
-import json
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, TextIO
+
+import orjson
+
 from src.utils.database import DatabaseManager
 
 
@@ -42,10 +44,7 @@ class ImportExportManager:
             tags = self.db_manager.get_all_tags()
             snippets = self.db_manager.get_all_snippets()
 
-            # Convert datetime objects to ISO strings
-            snippets = self._serialize_datetime(snippets)
-
-            # Build export data
+            # Build export data (orjson writes datetimes as ISO strings)
             export_data = {
                 'version': '1.0',
                 'exported_at': datetime.now().isoformat(),
@@ -53,9 +52,8 @@ class ImportExportManager:
                 'snippets': snippets if include_stats else self._strip_stats(snippets),
             }
 
-            # Write to file
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(export_data, f, indent=2, ensure_ascii=False)
+            # Write to file (UTF-8 bytes, non-ASCII kept as-is)
+            Path(file_path).write_bytes(orjson.dumps(export_data, option=orjson.OPT_INDENT_2))
 
             return True
 
@@ -76,8 +74,7 @@ class ImportExportManager:
         """
         try:
             # Read file
-            with open(file_path, 'r', encoding='utf-8') as f:
-                import_data = json.load(f)
+            import_data = orjson.loads(Path(file_path).read_bytes())
 
             # Validate format
             if 'version' not in import_data or 'tags' not in import_data or 'snippets' not in import_data:
@@ -109,49 +106,45 @@ class ImportExportManager:
             tags = self.db_manager.get_all_tags()
             snippets = self.db_manager.get_all_snippets()
 
-            # Build markdown
-            lines = [
-                "# Code Snippets",
-                "",
-                f"Exported on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-                "",
-                f"Total: {len(snippets)} snippets in {len(tags)} tags",
-                "",
-                "---",
-                ""
-            ]
-
-            if organize_by_tag:
-                # Organize by tags
-                tag_dict = {tag['id']: tag for tag in tags}
-
-                for tag in tags:
-                    tag_snippets = self.db_manager.get_snippets_by_tag(tag['id'])
-                    if not tag_snippets:
-                        continue
-
-                    # Tag header
-                    lines.append(f"## {tag['icon']} {tag['name']}")
-                    if tag.get('description'):
-                        lines.append(f"*{tag['description']}*")
-                    lines.append("")
-
-                    # Snippets under this tag
-                    for snippet in tag_snippets:
-                        self._add_snippet_markdown(lines, snippet)
-
-                    lines.append("")
-            else:
-                # Flat list
-                lines.append("## All Snippets")
-                lines.append("")
-
-                for snippet in sorted(snippets, key=lambda s: s['name']):
-                    self._add_snippet_markdown(lines, snippet)
-
-            # Write to file
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(lines))
+            # Stream markdown straight to a buffered file instead of
+            # building the whole document in memory
+            with open(file_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                f.write(
+                    "# Code Snippets\n"
+                    "\n"
+                    f"Exported on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+                    "\n"
+                    f"Total: {len(snippets)} snippets in {len(tags)} tags\n"
+                    "\n"
+                    "---\n"
+                    "\n"
+                )
+
+                if organize_by_tag:
+                    # Organize by tags (one query for all tag/snippet links)
+                    snippets_by_tag = self.db_manager.get_snippets_grouped_by_tag()
+                    for tag in tags:
+                        tag_snippets = snippets_by_tag.get(tag['id'])
+                        if not tag_snippets:
+                            continue
+
+                        # Tag header
+                        f.write(f"## {tag['icon']} {tag['name']}\n")
+                        if tag.get('description'):
+                            f.write(f"*{tag['description']}*\n")
+                        f.write("\n")
+
+                        # Snippets under this tag
+                        for snippet in tag_snippets:
+                            self._write_snippet_markdown(f, snippet)
+
+                        f.write("\n")
+                else:
+                    # Flat list
+                    f.write("## All Snippets\n\n")
+
+                    for snippet in sorted(snippets, key=lambda s: s['name']):
+                        self._write_snippet_markdown(f, snippet)
 
             return True
 
@@ -159,25 +152,22 @@ class ImportExportManager:
             print(f"Export to Markdown failed: {e}")
             return False
 
-    def _add_snippet_markdown(self, lines: List[str], snippet: Dict[str, Any]):
-        """Add snippet to markdown lines."""
-        lines.append(f"### {snippet['name']}")
+    def _write_snippet_markdown(self, f: TextIO, snippet: Dict[str, Any]):
+        """Write snippet as markdown to an open file."""
+        f.write(f"### {snippet['name']}\n")
 
         if snippet.get('description'):
-            lines.append(f"{snippet['description']}")
-            lines.append("")
+            f.write(f"{snippet['description']}\n\n")
 
         # Language and stats
         lang = snippet.get('language', 'text')
         usage = snippet.get('usage_count', 0)
-        lines.append(f"**Language**: {lang} | **Used**: {usage} times")
-        lines.append("")
+        f.write(f"**Language**: {lang} | **Used**: {usage} times\n\n")
 
         # Code block
-        lines.append(f"```{lang}")
-        lines.append(snippet['code'])
-        lines.append("```")
-        lines.append("")
+        f.write(f"```{lang}\n")
+        f.write(snippet['code'])
+        f.write("\n```\n\n")
 
     def _strip_stats(self, snippets: List[Dict]) -> List[Dict]:
         """Remove usage statistics from snippets."""
@@ -237,40 +227,20 @@ class ImportExportManager:
             Dictionary with export statistics
         """
         tags = self.db_manager.get_all_tags()
-        snippets = self.db_manager.get_all_snippets()
+        snippets = self.db_manager.get_snippet_table()
 
         # Count snippets by language
         lang_count = {}
-        for snippet in snippets:
-            lang = snippet.get('language', 'unknown')
+        for lang in snippets.languages:
             lang_count[lang] = lang_count.get(lang, 0) + 1
 
         # Total usage
-        total_usage = sum(s.get('usage_count', 0) for s in snippets)
+        total_usage = sum(snippets.usage_counts)
 
         return {
             'total_tags': len(tags),
             'total_snippets': len(snippets),
             'languages': lang_count,
             'total_usage': total_usage,
-            'avg_usage': total_usage / len(snippets) if snippets else 0,
+            'avg_usage': total_usage / len(snippets) if len(snippets) else 0,
         }
-
-    def _serialize_datetime(self, snippets: List[Dict]) -> List[Dict]:
-        """
-        Convert datetime objects to ISO format strings.
-
-        Args:
-            snippets: List of snippet dictionaries
-
-        Returns:
-            List of snippets with datetime converted to strings
-        """
-        serialized = []
-        for snippet in snippets:
-            snippet_copy = snippet.copy()
-            if 'last_used' in snippet_copy and snippet_copy['last_used']:
-                if hasattr(snippet_copy['last_used'], 'isoformat'):
-                    snippet_copy['last_used'] = snippet_copy['last_used'].isoformat()
-            serialized.append(snippet_copy)
-        return serialized
@@ -6,13 +6,47 @@ Provides syntax highlighting for code snippets with:
 - HTML output with CSS styling
 - Dark/light theme support
 - Line number support
+
+Pygments is imported on first use, so importing this module is cheap.
 """
 
+import functools
 from typing import Optional
-from pygments import highlight
-from pygments.lexers import get_lexer_by_name, guess_lexer, TextLexer
-from pygments.formatters import HtmlFormatter
-from pygments.styles import get_style_by_name, get_all_styles
+
+
+@functools.lru_cache(maxsize=64)
+def _get_lexer(name: str):
+    """
+    Get a (reusable) lexer by name, falling back to plain text.
+
+    Lexer lookup scans Pygments' registry and plugins, so results,
+    including the fallback for unknown names, are cached.
+    """
+    from pygments.lexers import get_lexer_by_name, TextLexer
+
+    try:
+        return get_lexer_by_name(name, stripall=True)
+    except Exception:
+        return TextLexer()
+
+
+@functools.lru_cache(maxsize=32)
+def _get_formatter(style: str, line_numbers: bool, wrapcode: bool = True):
+    """Get a (reusable) HTML formatter; construction resolves the style."""
+    from pygments.formatters import HtmlFormatter
+
+    return HtmlFormatter(
+        style=style,
+        linenos='table' if line_numbers else False,
+        cssclass='highlight',
+        wrapcode=wrapcode,
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _get_style_defs(style: str, line_numbers: bool) -> str:
+    """Get the (deterministic) CSS for a style."""
+    return _get_formatter(style, line_numbers, wrapcode=False).get_style_defs('.highlight')
 
 
 class SyntaxHighlighter:
@@ -52,6 +86,8 @@ class SyntaxHighlighter:
         Returns:
             List of style names
         """
+        from pygments.styles import get_all_styles
+
         return list(get_all_styles())
 
     @staticmethod
@@ -90,26 +126,25 @@ class SyntaxHighlighter:
         if not code:
             return ""
 
-        # Get lexer
-        try:
-            if language:
-                # Normalize language name
-                language = self.normalize_language(language)
-                lexer = get_lexer_by_name(language, stripall=True)
-            else:
-                # Auto-detect language
+        from pygments import highlight
+
+        # Get lexer (cached per language)
+        if language:
+            # Normalize language name
+            language = self.normalize_language(language)
+            lexer = _get_lexer(language)
+        else:
+            from pygments.lexers import guess_lexer, TextLexer
+
+            # Auto-detect language
+            try:
                 lexer = guess_lexer(code)
-        except Exception:
-            # Fallback to plain text
-            lexer = TextLexer()
+            except Exception:
+                # Fallback to plain text
+                lexer = TextLexer()
 
-        # Configure formatter
-        formatter = HtmlFormatter(
-            style=self.style,
-            linenos='table' if self.line_numbers else False,
-            cssclass='highlight',
-            wrapcode=True,
-        )
+        # Formatter is cached per style/line number setting
+        formatter = _get_formatter(self.style, self.line_numbers)
 
         # Generate highlighted HTML
         html = highlight(code, lexer, formatter)
@@ -123,12 +158,7 @@ class SyntaxHighlighter:
         Returns:
             CSS string
         """
-        formatter = HtmlFormatter(
-            style=self.style,
-            linenos='table' if self.line_numbers else False,
-            cssclass='highlight'
-        )
-        return formatter.get_style_defs('.highlight')
+        return _get_style_defs(self.style, self.line_numbers)
 
     def set_style(self, style: str):
         """
@@ -137,6 +167,8 @@ class SyntaxHighlighter:
         Args:
             style: Pygments style name
         """
+        from pygments.styles import get_style_by_name
+
         # Validate style
         try:
             get_style_by_name(style)
@@ -164,6 +196,8 @@ class SyntaxHighlighter:
         Returns:
             Detected language name
         """
+        from pygments.lexers import guess_lexer
+
         try:
             lexer = guess_lexer(code)
             return lexer.name
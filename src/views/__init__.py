@@ -1,14 +1,32 @@
-"""View components for Code Snippet Manager GUI."""
-
-from .gadget_window import GadgetWindow
-from .snippet_dialog import SnippetDialog
-from .settings_dialog import SettingsDialog
-from .code_highlighter import CodeHighlighter, apply_highlighter
-
-__all__ = [
-    'GadgetWindow',
-    'SnippetDialog',
-    'SettingsDialog',
-    'CodeHighlighter',
-    'apply_highlighter',
-]
+"""View components for Code Snippet Manager GUI.
+
+Components are imported on first attribute access (PEP 562), so importing
+one view module does not load every dialog and Pygments with it.
+"""
+
+import importlib
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    'GadgetWindow': '.gadget_window',
+    'SnippetDialog': '.snippet_dialog',
+    'SettingsDialog': '.settings_dialog',
+    'CodeHighlighter': '.code_highlighter',
+    'apply_highlighter': '.code_highlighter',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # Later lookups bypass __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -5,6 +5,9 @@ Provides real-time syntax highlighting using Pygments
 integrated with PyQt6's QSyntaxHighlighter.
 """
 
+import functools
+from collections import OrderedDict
+
 from PyQt6.QtGui import (
     QSyntaxHighlighter, QTextCharFormat, QFont, QColor
 )
@@ -16,6 +19,104 @@ from pygments.token import Token
 from pygments.styles import get_style_by_name
 
 
+# Token type to color mapping for dark theme
+DARK_THEME_COLORS = {
+    Token.Keyword: '#F92672',           # Pink/Magenta
+    Token.Keyword.Namespace: '#F92672',
+    Token.Keyword.Type: '#66D9EF',      # Cyan
+    Token.Name.Class: '#A6E22E',        # Green
+    Token.Name.Function: '#A6E22E',
+    Token.Name.Builtin: '#66D9EF',
+    Token.Name.Decorator: '#F92672',
+    Token.String: '#E6DB74',            # Yellow
+    Token.String.Doc: '#75715E',        # Gray (docstring)
+    Token.Number: '#AE81FF',            # Purple
+    Token.Comment: '#75715E',           # Gray
+    Token.Comment.Single: '#75715E',
+    Token.Comment.Multiline: '#75715E',
+    Token.Operator: '#F92672',
+    Token.Punctuation: '#F8F8F2',       # White
+    Token.Name: '#F8F8F2',
+    Token.Literal: '#AE81FF',
+    Token.Error: '#960050',             # Red
+}
+
+# Token type to color mapping for light theme
+LIGHT_THEME_COLORS = {
+    Token.Keyword: '#0000FF',           # Blue
+    Token.Keyword.Namespace: '#0000FF',
+    Token.Keyword.Type: '#2B91AF',      # Teal
+    Token.Name.Class: '#2B91AF',
+    Token.Name.Function: '#000000',
+    Token.Name.Builtin: '#0000FF',
+    Token.Name.Decorator: '#A31515',    # Red
+    Token.String: '#A31515',            # Red
+    Token.String.Doc: '#008000',        # Green (docstring)
+    Token.Number: '#09885A',            # Dark green
+    Token.Comment: '#008000',           # Green
+    Token.Comment.Single: '#008000',
+    Token.Comment.Multiline: '#008000',
+    Token.Operator: '#000000',
+    Token.Punctuation: '#000000',
+    Token.Name: '#000000',
+    Token.Literal: '#09885A',
+    Token.Error: '#FF0000',             # Red
+}
+
+# Token types rendered bold / italic
+_BOLD_TOKENS = (Token.Keyword, Token.Keyword.Namespace)
+_ITALIC_TOKENS = (Token.Comment, Token.Comment.Single, Token.Comment.Multiline, Token.String.Doc)
+
+
+@functools.lru_cache(maxsize=None)
+def _theme_formats(theme: str) -> dict:
+    """
+    Build the text formats for a theme (once per process).
+
+    The returned dict is shared by all highlighters and must not be modified.
+
+    Args:
+        theme: 'dark' or 'light'
+
+    Returns:
+        Dict mapping token type to QTextCharFormat
+    """
+    colors = DARK_THEME_COLORS if theme == 'dark' else LIGHT_THEME_COLORS
+
+    formats = {}
+    for token_type, color in colors.items():
+        fmt = QTextCharFormat()
+        fmt.setForeground(QColor(color))
+
+        # Bold for keywords
+        if token_type in _BOLD_TOKENS:
+            fmt.setFontWeight(QFont.Weight.Bold)
+
+        # Italic for comments
+        if token_type in _ITALIC_TOKENS:
+            fmt.setFontItalic(True)
+
+        formats[token_type] = fmt
+    return formats
+
+
+@functools.lru_cache(maxsize=None)
+def _resolved_formats(theme: str) -> dict:
+    """
+    Flat token type -> format table for a theme, filled in on first use.
+
+    Shared by all highlighters, so each concrete token type walks its
+    parent chain once per process.
+
+    Args:
+        theme: 'dark' or 'light'
+
+    Returns:
+        Dict mapping token type to QTextCharFormat (None if no format applies)
+    """
+    return {}
+
+
 class CodeHighlighter(QSyntaxHighlighter):
     """
     Syntax highlighter for QTextEdit using Pygments.
@@ -23,49 +124,12 @@ class CodeHighlighter(QSyntaxHighlighter):
     Provides real-time highlighting as user types.
     """
 
-    # Token type to color mapping for dark theme
-    DARK_THEME_COLORS = {
-        Token.Keyword: '#F92672',           # Pink/Magenta
-        Token.Keyword.Namespace: '#F92672',
-        Token.Keyword.Type: '#66D9EF',      # Cyan
-        Token.Name.Class: '#A6E22E',        # Green
-        Token.Name.Function: '#A6E22E',
-        Token.Name.Builtin: '#66D9EF',
-        Token.Name.Decorator: '#F92672',
-        Token.String: '#E6DB74',            # Yellow
-        Token.String.Doc: '#75715E',        # Gray (docstring)
-        Token.Number: '#AE81FF',            # Purple
-        Token.Comment: '#75715E',           # Gray
-        Token.Comment.Single: '#75715E',
-        Token.Comment.Multiline: '#75715E',
-        Token.Operator: '#F92672',
-        Token.Punctuation: '#F8F8F2',       # White
-        Token.Name: '#F8F8F2',
-        Token.Literal: '#AE81FF',
-        Token.Error: '#960050',             # Red
-    }
-
-    # Token type to color mapping for light theme
-    LIGHT_THEME_COLORS = {
-        Token.Keyword: '#0000FF',           # Blue
-        Token.Keyword.Namespace: '#0000FF',
-        Token.Keyword.Type: '#2B91AF',      # Teal
-        Token.Name.Class: '#2B91AF',
-        Token.Name.Function: '#000000',
-        Token.Name.Builtin: '#0000FF',
-        Token.Name.Decorator: '#A31515',    # Red
-        Token.String: '#A31515',            # Red
-        Token.String.Doc: '#008000',        # Green (docstring)
-        Token.Number: '#09885A',            # Dark green
-        Token.Comment: '#008000',           # Green
-        Token.Comment.Single: '#008000',
-        Token.Comment.Multiline: '#008000',
-        Token.Operator: '#000000',
-        Token.Punctuation: '#000000',
-        Token.Name: '#000000',
-        Token.Literal: '#09885A',
-        Token.Error: '#FF0000',             # Red
-    }
+    # Token type to color mappings (shared with the module-level tables)
+    DARK_THEME_COLORS = DARK_THEME_COLORS
+    LIGHT_THEME_COLORS = LIGHT_THEME_COLORS
+
+    # Number of distinct block texts whose highlighting is remembered
+    BLOCK_CACHE_SIZE = 512
 
     def __init__(self, parent=None, language: str = 'python', theme: str = 'dark'):
         """
@@ -79,6 +143,10 @@ class CodeHighlighter(QSyntaxHighlighter):
         super().__init__(parent)
         self.language = language
         self.theme = theme
+
+        # Block text -> [(start, length, format)], least recently used first
+        self._block_cache = OrderedDict()
+
         self._setup_lexer()
         self._setup_formats()
 
@@ -88,30 +156,15 @@ class CodeHighlighter(QSyntaxHighlighter):
             self.lexer = get_lexer_by_name(self.language, stripall=True)
         except Exception:
             self.lexer = TextLexer()
+        self._block_cache.clear()
 
     def _setup_formats(self):
         """Setup text formats for each token type."""
-        self.formats = {}
-
-        # Choose color scheme based on theme
-        colors = (self.DARK_THEME_COLORS if self.theme == 'dark'
-                 else self.LIGHT_THEME_COLORS)
-
-        # Create QTextCharFormat for each token type
-        for token_type, color in colors.items():
-            fmt = QTextCharFormat()
-            fmt.setForeground(QColor(color))
-
-            # Bold for keywords
-            if token_type in [Token.Keyword, Token.Keyword.Namespace]:
-                fmt.setFontWeight(QFont.Weight.Bold)
-
-            # Italic for comments
-            if token_type in [Token.Comment, Token.Comment.Single,
-                            Token.Comment.Multiline, Token.String.Doc]:
-                fmt.setFontItalic(True)
-
-            self.formats[token_type] = fmt
+        # Formats are built once per theme and shared between highlighters
+        self.formats = _theme_formats(self.theme)
+        # Token type -> resolved format (None if no format applies)
+        self._fmt_cache = _resolved_formats(self.theme)
+        self._block_cache.clear()
 
     def highlightBlock(self, text: str):
         """
@@ -125,29 +178,74 @@ class CodeHighlighter(QSyntaxHighlighter):
         if not text:
             return
 
+        # Unchanged blocks (e.g. on rehighlight or when editing another
+        # line) reuse their spans instead of being lexed again
+        spans = self._block_cache.get(text)
+        if spans is None:
+            spans = self._lex_block(text)
+            if spans is None:
+                return
+            self._block_cache[text] = spans
+            if len(self._block_cache) > self.BLOCK_CACHE_SIZE:
+                self._block_cache.popitem(last=False)
+        else:
+            self._block_cache.move_to_end(text)
+
+        for position, length, fmt in spans:
+            self.setFormat(position, length, fmt)
+
+    def _lex_block(self, text: str):
+        """
+        Tokenize a block and resolve the format of each token.
+
+        Args:
+            text: Text block to tokenize
+
+        Returns:
+            List of (start, length, format) spans, or None if lexing failed
+        """
         # Tokenize the text
         try:
-            tokens = list(lex(text, self.lexer))
+            tokens = lex(text, self.lexer)
+            spans = []
+            position = 0
+            for token_type, token_value in tokens:
+                length = len(token_value)
+                fmt = self._resolve_format(token_type)
+                if fmt:
+                    spans.append((position, length, fmt))
+                position += length
         except Exception:
-            return
+            return None
+
+        return spans
 
-        # Apply formatting to each token
-        position = 0
-        for token_type, token_value in tokens:
-            length = len(token_value)
+    def _resolve_format(self, token_type):
+        """
+        Find the format for a token type (checking parent types if needed).
 
-            # Find matching format (check parent types if exact match not found)
-            fmt = None
-            check_type = token_type
-            while check_type and not fmt:
-                fmt = self.formats.get(check_type)
-                check_type = check_type.parent
+        The walk up the token hierarchy runs once per distinct token type
+        and theme.
 
-            # Apply format if found
-            if fmt:
-                self.setFormat(position, length, fmt)
+        Args:
+            token_type: Pygments token type
 
-            position += length
+        Returns:
+            QTextCharFormat, or None if no format applies
+        """
+        try:
+            return self._fmt_cache[token_type]
+        except KeyError:
+            pass
+
+        fmt = None
+        check_type = token_type
+        while check_type and not fmt:
+            fmt = self.formats.get(check_type)
+            check_type = check_type.parent
+
+        self._fmt_cache[token_type] = fmt
+        return fmt
 
     def set_language(self, language: str):
         """
@@ -4,25 +4,192 @@ This module implements a semi-transparent, edge-docked window with smooth animat
 """
 
 from PyQt6.QtWidgets import (
-    QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
+    QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QTreeWidget, QTreeWidgetItem, QTextEdit, QLineEdit,
-    QPushButton, QLabel, QSplitter, QMenu, QMessageBox
+    QPushButton, QLabel, QSplitter, QMenu, QMessageBox, QToolTip
+)
+from PyQt6.QtCore import Qt, QTimer, QTimeLine, QEasingCurve, QRect, pyqtSignal
+from PyQt6.QtGui import (
+    QPalette, QColor, QFont, QAction, QGuiApplication, QTextDocument, QPainterPath, QRegion
 )
-from PyQt6.QtCore import Qt, QTimer, QPropertyAnimation, QEasingCurve, QRect, pyqtSignal
-from PyQt6.QtGui import QPalette, QColor, QFont, QAction
 
+import functools
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
 from typing import Optional
-import sys
-from pathlib import Path
-
-# Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from src.utils.config import Config
 from src.utils.database import DatabaseManager
-from src.utils.fuzzy_search import fuzzy_search_snippets, fuzzy_search_tags
+from src.utils.fuzzy_search import FuzzySearcher, fuzzy_search_tags
 from src.views.snippet_dialog import SnippetDialog
-from src.views.code_highlighter import apply_highlighter, normalize_language
+from src.views.code_highlighter import CodeHighlighter, normalize_language
+
+
+# Tree text colors (shared by every build instead of parsed per row)
+_SNIPPET_COLOR = QColor("#AAAAAA")
+_DESCRIPTION_COLOR = QColor("#888888")
+_TAGS_HEADER_COLOR = QColor("#FFEB3B")  # Yellow
+_SNIPPETS_HEADER_COLOR = QColor("#64B5F6")  # Light blue
+_HIGH_MATCH_COLOR = QColor("#4CAF50")  # Green
+_MEDIUM_MATCH_COLOR = QColor("#FFC107")  # Amber
+_LOW_MATCH_COLOR = QColor("#FF9800")  # Orange
+
+
+@functools.lru_cache(maxsize=256)
+def _tag_color(name: str) -> QColor:
+    """Return a shared QColor for a tag color string."""
+    return QColor(name)
+
+
+def _tag_label(tag: dict, snippet_count: int) -> str:
+    """Return the tree label of a tag with its snippet count."""
+    if snippet_count > 0:
+        return f"{tag['icon']} {tag['name']} ({snippet_count})"
+    return f"{tag['icon']} {tag['name']}"
+
+
+@functools.lru_cache(maxsize=8)
+def _rounded_region(width: int, height: int) -> QRegion:
+    """Return the rounded-corner window mask for a window size."""
+    path = QPainterPath()
+    path.addRoundedRect(0, 0, width, height, 20, 20)
+    return QRegion(path.toFillPolygon().toPolygon())
+
+
+def _score_color(score: float) -> QColor:
+    """Return the text color for a search match score."""
+    if score > 0.7:
+        return _HIGH_MATCH_COLOR
+    if score > 0.5:
+        return _MEDIUM_MATCH_COLOR
+    return _LOW_MATCH_COLOR
+
+
+# Window style sheet for the dark theme
+WINDOW_DARK_QSS = """
+    QMainWindow {
+        background-color: rgba(30, 30, 30, 240);
+        border: 1px solid #444444;
+        border-radius: 10px;
+    }
+"""
+
+# Context menu style, set with the window style sheet so that menus
+# inherit it instead of parsing their own sheet on every right-click
+MENU_QSS = """
+    QMenu {
+        background-color: #2E2E2E;
+        color: white;
+        border: 1px solid #444444;
+        padding: 5px;
+    }
+    QMenu::item {
+        padding: 5px 20px;
+    }
+    QMenu::item:selected {
+        background-color: #0D47A1;
+    }
+"""
+
+# Style sheet for the window contents, applied once to the central widget.
+# Widgets are targeted by object name, so one style pass covers them all.
+GADGET_QSS = """
+    QWidget {
+        background-color: rgba(28, 28, 30, 255);
+        border-radius: 20px;
+    }
+
+    QLabel#titleLabel {
+        font-size: 14px;
+        font-weight: bold;
+        color: #FFFFFF;
+    }
+
+    QPushButton#closeButton {
+        background-color: rgba(255, 95, 86, 255);
+        border: 1px solid rgba(200, 75, 66, 255);
+        border-radius: 7px;
+    }
+    QPushButton#closeButton:hover {
+        background-color: rgba(255, 95, 86, 255);
+        border: 1px solid rgba(100, 40, 35, 255);
+    }
+    QPushButton#closeButton:pressed {
+        background-color: rgba(200, 75, 66, 255);
+    }
+
+    QPushButton#minimizeButton {
+        background-color: rgba(255, 189, 68, 255);
+        border: 1px solid rgba(200, 150, 50, 255);
+        border-radius: 7px;
+    }
+    QPushButton#minimizeButton:hover {
+        background-color: rgba(255, 189, 68, 255);
+        border: 1px solid rgba(120, 90, 30, 255);
+    }
+    QPushButton#minimizeButton:pressed {
+        background-color: rgba(200, 150, 50, 255);
+    }
+
+    QPushButton#alwaysOnTopButton {
+        background-color: rgba(40, 205, 65, 255);
+        border: 1px solid rgba(30, 160, 50, 255);
+        border-radius: 7px;
+    }
+    QPushButton#alwaysOnTopButton:hover {
+        background-color: rgba(40, 205, 65, 255);
+        border: 1px solid rgba(20, 100, 35, 255);
+    }
+    QPushButton#alwaysOnTopButton:pressed {
+        background-color: rgba(30, 160, 50, 255);
+    }
+    QPushButton#alwaysOnTopButton[pinned="false"] {
+        background-color: rgba(40, 205, 65, 120);
+    }
+    QPushButton#alwaysOnTopButton[pinned="false"]:hover {
+        background-color: rgba(40, 205, 65, 180);
+    }
+    QPushButton#alwaysOnTopButton[pinned="false"]:pressed {
+        background-color: rgba(30, 160, 50, 255);
+    }
+
+    QLineEdit#searchInput {
+        background-color: #2E2E2E;
+        color: white;
+        border: 1px solid #444444;
+        border-radius: 5px;
+        padding: 8px;
+        font-size: 13px;
+    }
+    QLineEdit#searchInput:focus {
+        border: 1px solid #64B5F6;
+    }
+
+    QLabel#statusLabel {
+        color: #888888;
+        font-size: 11px;
+    }
+
+    QPushButton#newButton, QPushButton#settingsButton {
+        color: white;
+        border: none;
+        border-radius: 3px;
+        padding: 5px 15px;
+        font-size: 11px;
+    }
+    QPushButton#newButton {
+        background-color: #1976D2;
+    }
+    QPushButton#newButton:hover {
+        background-color: #2196F3;
+    }
+    QPushButton#settingsButton {
+        background-color: #616161;
+    }
+    QPushButton#settingsButton:hover {
+        background-color: #757575;
+    }
+"""
 
 
 class GadgetWindow(QMainWindow):
@@ -40,6 +207,28 @@ class GadgetWindow(QMainWindow):
     snippet_selected = pyqtSignal(dict)  # Emitted when snippet is selected
     tag_selected = pyqtSignal(dict)  # Emitted when tag is selected
 
+    # Delay after the last keystroke before the search runs (ms)
+    SEARCH_DEBOUNCE_MS = 200
+
+    # Interval between fade animation frames (ms, ~30 FPS)
+    FADE_FRAME_MS = 33
+
+    # Number of highlighted preview documents kept for recently shown snippets
+    PREVIEW_CACHE_SIZE = 32
+
+    # Number of search queries whose results are remembered
+    SEARCH_CACHE_SIZE = 128
+
+    # Above this many snippet rows, tags start collapsed and their snippet
+    # rows are only created when the tag is first expanded
+    LAZY_TREE_THRESHOLD = 500
+
+    # Item data role marking a tag whose snippet rows are not created yet
+    PENDING_SNIPPETS_ROLE = Qt.ItemDataRole.UserRole + 1
+
+    # Delay before collected usage counts are written to the database (ms)
+    USAGE_FLUSH_MS = 5000
+
     def __init__(self, config: Config, db_manager: DatabaseManager):
         """Initialize the gadget window.
 
@@ -58,12 +247,50 @@ class GadgetWindow(QMainWindow):
         self.is_always_on_top = True  # Default: always on top
         self.normal_height = None  # Store normal height for minimize/restore
 
+        # Incremental search state (reuses work while the query grows)
+        self.snippet_searcher = FuzzySearcher(threshold=0.3)
+        self._pending_query = ''  # Latest search text, not yet searched
+        self._last_query = ''  # Search text currently shown in the tree
+
+        # Query -> (snippet_results, tag_results), LRU order. Valid for the
+        # snippet/tag lists in _search_cache_data (the manager hands out new
+        # lists after any change).
+        self._search_cache = OrderedDict()
+        self._search_cache_data = None
+
+        # Top-level items of the full tree, set aside while search results
+        # are shown (None when the tree shows the full data)
+        self._browse_items = None
+
+        # Tag id -> snippets, kept until the tree is reloaded
+        self._tag_snippets_cache = {}
+        # Tag list the tree was built from, and tag id -> its tree item
+        self._tree_tags = None
+        self._tag_items = {}
+        # Tags the user had open in a lazy tree, restored after rebuilds
+        self._expanded_tag_ids = set()
+        self._previewed_tag_id = None  # Tag whose first snippet is previewed
+
+        # Primary screen geometry, cached until the screen setup changes
+        self._screen_geometry = None
+        self._watched_screen = None
+        QGuiApplication.instance().primaryScreenChanged.connect(self._invalidate_screen_geometry)
+
+        # Snippet id -> uses not yet written to the database
+        self._pending_usage = defaultdict(int)
+        self._usage_timer = QTimer(self)
+        self._usage_timer.setSingleShot(True)
+        self._usage_timer.setInterval(self.USAGE_FLUSH_MS)
+        self._usage_timer.timeout.connect(self._flush_usage)
+
         # Setup UI
         self._setup_window()
         self._setup_ui()
         self._setup_animations()
         self._apply_rounded_mask()
-        self._load_data()
+
+        # The tree is filled when the window is first shown (see showEvent)
+        self._data_loaded = False
 
         # Install event filter to capture all wheel events
         self.installEventFilter(self)
@@ -102,11 +329,27 @@ class GadgetWindow(QMainWindow):
         # Position
         self._position_window()
 
+    def _primary_screen_geometry(self) -> QRect:
+        """Return the primary screen geometry (cached).
+
+        Returns:
+            Geometry of the primary screen.
+        """
+        if self._screen_geometry is None:
+            screen = QGuiApplication.primaryScreen()
+            if screen is not self._watched_screen:
+                screen.geometryChanged.connect(self._invalidate_screen_geometry)
+                self._watched_screen = screen
+            self._screen_geometry = screen.geometry()
+        return self._screen_geometry
+
+    def _invalidate_screen_geometry(self, *args):
+        """Forget the cached screen geometry (primary screen or its size changed)."""
+        self._screen_geometry = None
+
     def _position_window(self):
         """Position window at screen edge based on config."""
-        from PyQt6.QtGui import QGuiApplication
-
-        screen = QGuiApplication.primaryScreen().geometry()
+        screen = self._primary_screen_geometry()
 
         if self.config.appearance.position == 'right':
             # Right edge
@@ -129,12 +372,8 @@ class GadgetWindow(QMainWindow):
 
         # CRITICAL: Set solid background to ensure macOS recognizes this as a clickable area
         # Even though opacity is set at window level, we need a non-transparent background
-        central.setStyleSheet("""
-            QWidget {
-                background-color: rgba(28, 28, 30, 255);
-                border-radius: 20px;
-            }
-        """)
+        # (GADGET_QSS also styles all child widgets, so it is the only sheet set here)
+        central.setStyleSheet(GADGET_QSS)
 
         # Enable mouse tracking and event acceptance on central widget
         central.setMouseTracking(True)
@@ -174,7 +413,7 @@ class GadgetWindow(QMainWindow):
 
         # Title
         title = QLabel("Code Snippet Manager")
-        title.setStyleSheet("font-size: 14px; font-weight: bold; color: #FFFFFF;")
+        title.setObjectName("titleLabel")
         header.addWidget(title)
 
         header.addStretch()
@@ -189,20 +428,7 @@ class GadgetWindow(QMainWindow):
         self.btn_close.clicked.connect(self.close_application)
         self.btn_close.setToolTip("アプリケーションを終了")
         self.btn_close.setCursor(Qt.CursorShape.PointingHandCursor)
-        self.btn_close.setStyleSheet("""
-            QPushButton {
-                background-color: rgba(255, 95, 86, 255);
-                border: 1px solid rgba(200, 75, 66, 255);
-                border-radius: 7px;
-            }
-            QPushButton:hover {
-                background-color: rgba(255, 95, 86, 255);
-                border: 1px solid rgba(100, 40, 35, 255);
-            }
-            QPushButton:pressed {
-                background-color: rgba(200, 75, 66, 255);
-            }
-        """)
+        self.btn_close.setObjectName("closeButton")
         button_container.addWidget(self.btn_close)
 
         # Minimize button (Yellow) - 最小化
@@ -211,20 +437,7 @@ class GadgetWindow(QMainWindow):
         self.btn_minimize.clicked.connect(self.toggle_minimize)
         self.btn_minimize.setToolTip("ウィンドウを最小化/復元")
         self.btn_minimize.setCursor(Qt.CursorShape.PointingHandCursor)
-        self.btn_minimize.setStyleSheet("""
-            QPushButton {
-                background-color: rgba(255, 189, 68, 255);
-                border: 1px solid rgba(200, 150, 50, 255);
-                border-radius: 7px;
-            }
-            QPushButton:hover {
-                background-color: rgba(255, 189, 68, 255);
-                border: 1px solid rgba(120, 90, 30, 255);
-            }
-            QPushButton:pressed {
-                background-color: rgba(200, 150, 50, 255);
-            }
-        """)
+        self.btn_minimize.setObjectName("minimizeButton")
         button_container.addWidget(self.btn_minimize)
 
         # Always on top button (Green) - 常に最前面
@@ -233,20 +446,9 @@ class GadgetWindow(QMainWindow):
         self.btn_always_on_top.clicked.connect(self.toggle_always_on_top)
         self.btn_always_on_top.setToolTip("常に最前面に固定/解除")
         self.btn_always_on_top.setCursor(Qt.CursorShape.PointingHandCursor)
-        self.btn_always_on_top.setStyleSheet("""
-            QPushButton {
-                background-color: rgba(40, 205, 65, 255);
-                border: 1px solid rgba(30, 160, 50, 255);
-                border-radius: 7px;
-            }
-            QPushButton:hover {
-                background-color: rgba(40, 205, 65, 255);
-                border: 1px solid rgba(20, 100, 35, 255);
-            }
-            QPushButton:pressed {
-                background-color: rgba(30, 160, 50, 255);
-            }
-        """)
+        self.btn_always_on_top.setObjectName("alwaysOnTopButton")
+        # Dimmed via GADGET_QSS when the "pinned" property is false
+        self.btn_always_on_top.setProperty("pinned", self.is_always_on_top)
         button_container.addWidget(self.btn_always_on_top)
 
         header.addLayout(button_container)
@@ -260,24 +462,18 @@ class GadgetWindow(QMainWindow):
             parent_layout: Parent layout to add search bar to.
         """
         self.search_input = QLineEdit()
+        self.search_input.setObjectName("searchInput")
         self.search_input.setPlaceholderText("🔍 Search snippets...")
         self.search_input.textChanged.connect(self._on_search_changed)
+
+        # Run one search once typing pauses, not one per keystroke
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(self.SEARCH_DEBOUNCE_MS)
+        self._search_timer.timeout.connect(self._do_search)
         # Enable mouse tracking for search input
         self.search_input.setMouseTracking(True)
         self.search_input.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
-        self.search_input.setStyleSheet("""
-            QLineEdit {
-                background-color: #2E2E2E;
-                color: white;
-                border: 1px solid #444444;
-                border-radius: 5px;
-                padding: 8px;
-                font-size: 13px;
-            }
-            QLineEdit:focus {
-                border: 1px solid #64B5F6;
-            }
-        """)
         parent_layout.addWidget(self.search_input)
 
     def _create_content_area(self, parent_layout):
@@ -291,10 +487,17 @@ class GadgetWindow(QMainWindow):
         # Tree widget
         self.tree = QTreeWidget()
         self.tree.setHeaderHidden(True)
+        # All rows are single-line text in the same font: measure one row
+        # instead of asking every item for its size hint
+        self.tree.setUniformRowHeights(True)
+        # Long rows (descriptions) are cut to the tree's width with '...'
+        self.tree.setTextElideMode(Qt.TextElideMode.ElideRight)
         self.tree.itemClicked.connect(self._on_item_clicked)
         self.tree.itemDoubleClicked.connect(self._on_item_double_clicked)
         self.tree.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.tree.customContextMenuRequested.connect(self._show_context_menu)
+        self.tree.itemExpanded.connect(self._on_item_expanded)
+        self._lazy_tree = False  # Snippet rows are created on expand
         # Enable mouse tracking for tree widget
         self.tree.setMouseTracking(True)
         self.tree.setFocusPolicy(Qt.FocusPolicy.WheelFocus)
@@ -310,9 +513,14 @@ class GadgetWindow(QMainWindow):
         self.preview.setFocusPolicy(Qt.FocusPolicy.WheelFocus)
         # Style is now managed globally in main.py
 
-        # Initialize syntax highlighter
+        # Highlighted document per recently previewed snippet:
+        # snippet id -> (code, language, document, highlighter), LRU order
+        self._preview_documents = OrderedDict()
+        # Document for plain messages (not owned by the preview, so
+        # switching documents does not delete it)
+        self._message_document = QTextDocument(self)
+        self.preview.setDocument(self._message_document)
         self.highlighter = None
-        self.current_language = 'text'
 
         splitter.addWidget(self.preview)
 
@@ -332,7 +540,7 @@ class GadgetWindow(QMainWindow):
 
         # Status label
         self.status_label = QLabel("Ready")
-        self.status_label.setStyleSheet("color: #888888; font-size: 11px;")
+        self.status_label.setObjectName("statusLabel")
         footer.addWidget(self.status_label)
 
         footer.addStretch()
@@ -340,37 +548,13 @@ class GadgetWindow(QMainWindow):
         # Action buttons
         btn_new = QPushButton("+ New")
         btn_new.clicked.connect(self._create_new_snippet)
-        btn_new.setStyleSheet("""
-            QPushButton {
-                background-color: #1976D2;
-                color: white;
-                border: none;
-                border-radius: 3px;
-                padding: 5px 15px;
-                font-size: 11px;
-            }
-            QPushButton:hover {
-                background-color: #2196F3;
-            }
-        """)
+        btn_new.setObjectName("newButton")
         footer.addWidget(btn_new)
 
         # Settings button
         btn_settings = QPushButton("⚙ Settings")
         btn_settings.clicked.connect(self._open_settings)
-        btn_settings.setStyleSheet("""
-            QPushButton {
-                background-color: #616161;
-                color: white;
-                border: none;
-                border-radius: 3px;
-                padding: 5px 15px;
-                font-size: 11px;
-            }
-            QPushButton:hover {
-                background-color: #757575;
-            }
-        """)
+        btn_settings.setObjectName("settingsButton")
         footer.addWidget(btn_settings)
 
         parent_layout.addLayout(footer)
@@ -378,153 +562,405 @@ class GadgetWindow(QMainWindow):
     def _apply_theme(self):
         """Apply theme based on config."""
         if self.config.appearance.theme == 'dark':
-            self.setStyleSheet("""
-                QMainWindow {
-                    background-color: rgba(30, 30, 30, 240);
-                    border: 1px solid #444444;
-                    border-radius: 10px;
-                }
-            """)
+            self.setStyleSheet(WINDOW_DARK_QSS + MENU_QSS)
         else:
             # Light theme (future implementation)
-            pass
+            self.setStyleSheet(MENU_QSS)
 
     def _apply_rounded_mask(self):
         """Apply rounded corners mask to window."""
-        from PyQt6.QtGui import QPainterPath, QRegion
-
-        # Create a rounded rectangle path
-        path = QPainterPath()
-        path.addRoundedRect(0, 0, self.width(), self.height(), 20, 20)
-
-        # Create region from path and set as mask
-        region = QRegion(path.toFillPolygon().toPolygon())
-        self.setMask(region)
+        # The region is built once per window size (minimize/restore
+        # switches between the same few sizes)
+        self.setMask(_rounded_region(self.width(), self.height()))
+
+    def showEvent(self, event):
+        """Load the data on first show instead of at startup."""
+        super().showEvent(event)
+        if not self._data_loaded:
+            # Fill the tree on the next event loop pass, so the window is
+            # painted before the database is read
+            self._data_loaded = True
+            QTimer.singleShot(0, self._load_data)
 
     def resizeEvent(self, event):
         """Handle window resize events to reapply rounded mask."""
         super().resizeEvent(event)
-        self._apply_rounded_mask()
+        if event.size() != event.oldSize():
+            self._apply_rounded_mask()
 
     def _setup_animations(self):
         """Setup animation effects."""
-        # Opacity animation
-        self.fade_animation = QPropertyAnimation(self, b"windowOpacity")
-        self.fade_animation.setDuration(self.config.appearance.opacity_transition)
-        self.fade_animation.setEasingCurve(QEasingCurve.Type.InOutQuad)
+        # Opacity animation; a time line lets us cap the frame rate, since
+        # every opacity change recomposites the whole window
+        # (QTimeLine rejects durations <= 0; those skip the fade entirely)
+        self.fade_animation = QTimeLine(max(self.config.appearance.opacity_transition, 1), self)
+        self.fade_animation.setUpdateInterval(self.FADE_FRAME_MS)
+        self.fade_animation.setEasingCurve(QEasingCurve(QEasingCurve.Type.InOutQuad))
+        self.fade_animation.valueChanged.connect(self._on_fade_step)
+        self._fade_range = (0.0, 0.0)
+
+        # Connected once; only a fade-out hides the window when it finishes
+        self._fading_out = False
+        self.fade_animation.finished.connect(self._on_fade_finished)
 
     def _load_data(self):
         """Load tags and snippets from database."""
-        self.tree.clear()
+        self._data_loaded = True
+
+        if self._browse_items is None:
+            self._remember_expanded_tags()
 
         # Get all tags
         tags = self.db_manager.get_all_tags()
+        self._tree_tags = tags
+        self._browse_items = None
+        self._tag_snippets_cache.clear()
+        self._tag_items.clear()
+        self._previewed_tag_id = None
 
         # Build tree structure
-        self._build_tree(tags)
+        with self._batch_tree_update():
+            self.tree.clear()
+            self._build_tree(tags)
 
         # Update status
         self.status_label.setText(f"{len(tags)} tags loaded")
 
+    @contextmanager
+    def _batch_tree_update(self):
+        """Suspend tree repaints and item signals while it is rebuilt.
+
+        Qt then lays out and paints the tree once at the end instead of once
+        per inserted or expanded item. (Sorting is never enabled on the tree,
+        so insertion order is kept without re-sorting.)
+        """
+        self.tree.setUpdatesEnabled(False)
+        self.tree.blockSignals(True)
+        try:
+            yield
+        finally:
+            self.tree.blockSignals(False)
+            self.tree.setUpdatesEnabled(True)
+
     def _build_tree(self, tags):
         """Build tree widget from tag data with snippets.
 
         Args:
             tags: List of tag dictionaries.
         """
-        # Create a mapping of tag_id -> QTreeWidgetItem
-        tag_items = {}
-        root_items = []
-
-        # First pass: create tag items
+        # Index the hierarchy once: parent_id -> child tags (in tag order)
+        children_by_parent = defaultdict(list)
         for tag in tags:
-            # Get snippets for this tag
-            snippets = self.db_manager.get_snippets_by_tag(tag['id'])
-            snippet_count = len(snippets)
-
-            # Create tag item with snippet count
-            item = QTreeWidgetItem()
-            if snippet_count > 0:
-                item.setText(0, f"{tag['icon']} {tag['name']} ({snippet_count})")
-            else:
-                item.setText(0, f"{tag['icon']} {tag['name']}")
+            children_by_parent[tag['parent_id']].append(tag)
 
-            # Store tag data
-            item.setData(0, Qt.ItemDataRole.UserRole, {'type': 'tag', 'data': tag})
+        # Snippets of every tag in one query (also serves later tag clicks)
+        snippets_by_tag = self.db_manager.get_snippets_grouped_by_tag()
+        self._tag_snippets_cache.update(snippets_by_tag)
 
-            # Set color
-            color = QColor(tag['color'])
-            item.setForeground(0, color)
+        # Large libraries: only create snippet rows for tags the user opens
+        lazy = self._lazy_tree = (
+            sum(map(len, snippets_by_tag.values())) > self.LAZY_TREE_THRESHOLD
+        )
 
-            # Add snippet children
-            for snippet in snippets:
-                snippet_item = QTreeWidgetItem()
-                # Display name in first line
-                name = snippet['name']
-                snippet_item.setText(0, f"  📄 {name}")
-                snippet_item.setData(0, Qt.ItemDataRole.UserRole, {'type': 'snippet', 'data': snippet})
+        # Bind the per-row lookups once
+        tree_item = QTreeWidgetItem
+        user_role = Qt.ItemDataRole.UserRole
+        tag_items = self._tag_items
 
-                # Set snippet color (lighter)
-                snippet_color = QColor("#AAAAAA")
-                snippet_item.setForeground(0, snippet_color)
+        def build_items(parent_id):
+            """Create the items for the child tags of parent_id, top-down."""
+            items = []
+            for tag in children_by_parent.get(parent_id, ()):
+                # Get snippets for this tag
+                snippets = snippets_by_tag.get(tag['id'], [])
 
-                # Add description as child item (second line)
-                desc = snippet.get('description', '')
-                if desc:
-                    desc_short = desc if len(desc) <= 50 else desc[:47] + '...'
-                    desc_item = QTreeWidgetItem()
-                    desc_item.setText(0, f"     {desc_short}")
-                    desc_item.setForeground(0, QColor("#888888"))  # Even lighter gray
-                    desc_item.setFlags(desc_item.flags() & ~Qt.ItemFlag.ItemIsSelectable)  # Non-selectable
-                    snippet_item.addChild(desc_item)
+                # Create tag item with snippet count
+                item = tag_items[tag['id']] = tree_item()
+                item.setText(0, _tag_label(tag, len(snippets)))
+
+                # Store tag data
+                item.setData(0, user_role, {'type': 'tag', 'data': tag})
 
-                # Add usage count tooltip
-                if snippet['usage_count'] > 0:
-                    snippet_item.setToolTip(0, f"Used {snippet['usage_count']} times")
+                # Set color
+                item.setForeground(0, _tag_color(tag['color']))
 
-                item.addChild(snippet_item)
+                # Add snippet children (or defer them until the tag is expanded)
+                if lazy and snippets:
+                    item.setData(0, self.PENDING_SNIPPETS_ROLE, True)
+                    item.setChildIndicatorPolicy(QTreeWidgetItem.ChildIndicatorPolicy.ShowIndicator)
+                else:
+                    item.addChildren(self._create_snippet_items(snippets))
 
-            tag_items[tag['id']] = item
+                # Child tags follow the snippets (one insert per parent)
+                item.addChildren(build_items(tag['id']))
+                items.append(item)
+            return items
 
-            if tag['parent_id'] is None:
-                root_items.append(item)
+        # Add root items to tree (tags whose parent is missing are skipped)
+        self.tree.addTopLevelItems(build_items(None))
 
-        # Second pass: build tag hierarchy
-        for tag in tags:
-            if tag['parent_id'] is not None and tag['parent_id'] in tag_items:
-                parent_item = tag_items[tag['parent_id']]
-                parent_item.addChild(tag_items[tag['id']])
+        self._expand_tree()
+
+    def _expand_tree(self):
+        """Expand the browse tree (all of it, unless snippet rows are lazy)."""
+        if not self._lazy_tree:
+            self.tree.expandAll()
+            return
+
+        # Lazy tree: reopen the tags the user had expanded (item signals
+        # are blocked here, so their rows are created directly)
+        for tag_id in self._expanded_tag_ids:
+            item = self._tag_items.get(tag_id)
+            if item is not None:
+                self._on_item_expanded(item)
+                item.setExpanded(True)
+
+    def _remember_expanded_tags(self):
+        """Record which tags are expanded before the browse tree is taken down."""
+        if self._lazy_tree:
+            self._expanded_tag_ids = {
+                tag_id for tag_id, item in self._tag_items.items() if item.isExpanded()
+            }
+
+    def _create_snippet_items(self, snippets) -> list:
+        """Create the tree rows for a tag's snippets.
+
+        Args:
+            snippets: List of snippet dictionaries.
+
+        Returns:
+            List of QTreeWidgetItem, one per snippet (with description row).
+        """
+        # Bind the per-row lookups once (this loop runs for every snippet)
+        tree_item = QTreeWidgetItem
+        user_role = Qt.ItemDataRole.UserRole
+        not_selectable = ~Qt.ItemFlag.ItemIsSelectable
+
+        snippet_items = []
+        for snippet in snippets:
+            snippet_item = tree_item()
+            # Display name in first line
+            name = snippet['name']
+            snippet_item.setText(0, f"  📄 {name}")
+            snippet_item.setData(0, user_role, {'type': 'snippet', 'data': snippet})
+
+            # Set snippet color (lighter)
+            snippet_item.setForeground(0, _SNIPPET_COLOR)
+
+            # Add description as child item (second line; the tree elides
+            # long descriptions to its width)
+            desc = snippet.get('description', '')
+            if desc:
+                desc_item = tree_item()
+                desc_item.setText(0, f"     {desc}")
+                desc_item.setForeground(0, _DESCRIPTION_COLOR)  # Even lighter gray
+                desc_item.setFlags(desc_item.flags() & not_selectable)  # Non-selectable
+                snippet_item.addChild(desc_item)
+
+            snippet_items.append(snippet_item)
+        return snippet_items
+
+    def _snippet_tooltip(self, item: QTreeWidgetItem) -> Optional[str]:
+        """Build the tooltip of a snippet row (only when it is hovered).
+
+        Args:
+            item: Tree item under the cursor.
+
+        Returns:
+            Tooltip text, or None if the row has no tooltip.
+        """
+        item_data = item.data(0, Qt.ItemDataRole.UserRole)
+        if not item_data or item_data['type'] != 'snippet':
+            return None
+
+        snippet = item_data['data']
+        score = item_data.get('score')
+        if score is not None:
+            # Search result: show match info
+            return (
+                f"Match score: {int(score * 100)}%\n"
+                f"Language: {snippet.get('language', 'text')}\n"
+                f"Usage: {snippet.get('usage_count', 0)} times"
+            )
+
+        if snippet['usage_count'] > 0:
+            return f"Used {snippet['usage_count']} times"
+        return None
+
+    def _on_item_expanded(self, item: QTreeWidgetItem):
+        """Create a tag's deferred snippet rows when it is first expanded.
+
+        Args:
+            item: Expanded tree item.
+        """
+        if not item.data(0, self.PENDING_SNIPPETS_ROLE):
+            return
+
+        item.setData(0, self.PENDING_SNIPPETS_ROLE, False)
+        tag = item.data(0, Qt.ItemDataRole.UserRole)['data']
+        snippet_items = self._create_snippet_items(self._get_tag_snippets(tag['id']))
+
+        # Snippets come before child tags, as in the eagerly built tree
+        item.insertChildren(0, snippet_items)
+        for snippet_item in snippet_items:
+            snippet_item.setExpanded(True)
+
+    def _tags_of_snippet(self, snippet_id: int) -> list:
+        """Get the IDs of the tags whose rows in the tree show a snippet.
+
+        Args:
+            snippet_id: Snippet ID.
+
+        Returns:
+            List of tag IDs.
+        """
+        return [
+            tag_id for tag_id, snippets in self._tag_snippets_cache.items()
+            if any(snippet['id'] == snippet_id for snippet in snippets)
+        ]
+
+    def _update_tag_rows(self, tag_ids):
+        """Re-read the snippets of some tags and rebuild only their rows.
+
+        Used after a snippet is added, edited or deleted instead of rebuilding
+        the whole tree. Falls back to _load_data() only if the tags themselves
+        changed (added, removed, renamed or moved).
+
+        Args:
+            tag_ids: IDs of the tags whose snippets changed.
+        """
+        if not self._data_loaded:
+            return  # The tree is built from fresh data when first shown
+
+        tags = self.db_manager.get_all_tags()
+        if tags is not self._tree_tags:
+            # A new list can still hold the same tags, e.g. after an
+            # outside write that only touched snippets
+            if tags != self._tree_tags:
+                self._load_data()
+                return
+            self._tree_tags = tags
+
+        user_role = Qt.ItemDataRole.UserRole
+        self._previewed_tag_id = None
+
+        with self._batch_tree_update():
+            for tag_id in dict.fromkeys(tag_ids):
+                snippets = self.db_manager.get_snippets_by_tag(tag_id)
+                self._tag_snippets_cache[tag_id] = snippets
+
+                item = self._tag_items.get(tag_id)
+                if item is None:
+                    continue
+                item.setText(0, _tag_label(item.data(0, user_role)['data'], len(snippets)))
+
+                if item.data(0, self.PENDING_SNIPPETS_ROLE) and snippets:
+                    continue  # Rows are created from the new list on expand
+                item.setData(0, self.PENDING_SNIPPETS_ROLE, False)
+                item.setChildIndicatorPolicy(
+                    QTreeWidgetItem.ChildIndicatorPolicy.DontShowIndicatorWhenChildless
+                )
 
-        # Add root items to tree
-        self.tree.addTopLevelItems(root_items)
+                # Replace the snippet rows (they come before the child tags,
+                # which keep their items and expanded state)
+                while item.childCount() and item.child(0).data(0, user_role)['type'] == 'snippet':
+                    item.takeChild(0)
+                snippet_items = self._create_snippet_items(snippets)
+                item.insertChildren(0, snippet_items)
+                for snippet_item in snippet_items:
+                    snippet_item.setExpanded(True)
 
-        # Expand all
-        self.tree.expandAll()
+        if self._browse_items is not None:
+            # Search results are shown: search again with the new data
+            self._do_search()
 
     def _on_search_changed(self, text: str):
-        """Handle search input changes with fuzzy matching.
+        """Handle search input changes (schedules a debounced search).
 
         Args:
             text: Search query text.
         """
+        self._pending_query = text
+
+        if text == self._last_query:
+            # Back to what is already shown (e.g. typed and deleted a char)
+            self._search_timer.stop()
+            return
+
+        # (Re)start the timer; only the last text of a burst is searched
+        self._search_timer.start()
+
+    def _do_search(self):
+        """Run the fuzzy search for the latest search text."""
+        text = self._pending_query
+        self._last_query = text
+
         if not text:
-            # No search query - show all data
-            self._load_data()
+            # No search query - show all data again
+            self._restore_tree()
             return
 
-        # Get all snippets and tags
+        snippet_results, tag_results = self._search(text)
+
+        # Build filtered tree
+        with self._batch_tree_update():
+            self._build_search_results(snippet_results, tag_results, text)
+
+        total_results = len(snippet_results) + len(tag_results)
+        self.status_label.setText(f"Found {total_results} results for '{text}'")
+
+    def _search(self, text: str):
+        """Fuzzy search snippets and tags (memoized per query).
+
+        Args:
+            text: Search query text.
+
+        Returns:
+            Tuple of (snippet_results, tag_results) lists of (item, score).
+        """
+        # Get all snippets and tags (cached by the database manager)
         all_snippets = self.db_manager.get_all_snippets()
         all_tags = self.db_manager.get_all_tags()
 
+        data = self._search_cache_data
+        if data is None or data[0] is not all_snippets or data[1] is not all_tags:
+            # Data changed since the results were cached
+            self._search_cache.clear()
+            self._search_cache_data = (all_snippets, all_tags)
+
+        results = self._search_cache.get(text)
+        if results is not None:
+            self._search_cache.move_to_end(text)
+            return results
+
         # Perform fuzzy search
-        snippet_results = fuzzy_search_snippets(text, all_snippets, threshold=0.3)
+        snippet_results = self.snippet_searcher.search(text, all_snippets)
         tag_results = fuzzy_search_tags(text, all_tags, threshold=0.3)
 
-        # Build filtered tree
-        self._build_search_results(snippet_results, tag_results, text)
+        results = self._search_cache[text] = (snippet_results, tag_results)
+        if len(self._search_cache) > self.SEARCH_CACHE_SIZE:
+            self._search_cache.popitem(last=False)
+        return results
 
-        total_results = len(snippet_results) + len(tag_results)
-        self.status_label.setText(f"Found {total_results} results for '{text}'")
+    def _restore_tree(self):
+        """Show the full tree again after a search.
+
+        Reinserts the items set aside when the search started, so clearing the
+        search does not query the database and rebuild every item. Falls back
+        to _load_data() if the tree was reloaded in the meantime.
+        """
+        if self._browse_items is None:
+            self._load_data()
+            return
+
+        items, self._browse_items = self._browse_items, None
+
+        with self._batch_tree_update():
+            self.tree.clear()
+            self.tree.addTopLevelItems(items)
+            self._expand_tree()
+
+        self.status_label.setText(f"{len(self.db_manager.get_all_tags())} tags loaded")
 
     def _build_search_results(self, snippet_results, tag_results, query):
         """Build tree widget from search results.
@@ -534,109 +970,94 @@ class GadgetWindow(QMainWindow):
             tag_results: List of (tag, score) tuples
             query: Search query for highlighting
         """
+        if self._browse_items is None:
+            # Set the full tree aside for when the search is cleared
+            self._remember_expanded_tags()
+            self._browse_items = [
+                self.tree.takeTopLevelItem(0)
+                for _ in range(self.tree.topLevelItemCount())
+            ]
+
         self.tree.clear()
 
+        # Bind the per-row lookups once
+        tree_item = QTreeWidgetItem
+        user_role = Qt.ItemDataRole.UserRole
+        not_selectable = ~Qt.ItemFlag.ItemIsSelectable
+
+        # Subtrees are built completely before they are added to the tree
+        roots = []
+
         # Add matching tags
         if tag_results:
             tags_root = QTreeWidgetItem()
             tags_root.setText(0, f"📁 Matching Tags ({len(tag_results)})")
-            tags_root.setForeground(0, QColor("#FFEB3B"))  # Yellow
-            self.tree.addTopLevelItem(tags_root)
+            tags_root.setForeground(0, _TAGS_HEADER_COLOR)
+            roots.append(tags_root)
 
+            tag_items = []
             for tag, score in tag_results:
-                tag_item = QTreeWidgetItem()
+                tag_item = tree_item()
                 score_pct = int(score * 100)
                 tag_item.setText(0, f"{tag['icon']} {tag['name']} ({score_pct}%)")
-                tag_item.setData(0, Qt.ItemDataRole.UserRole, {'type': 'tag', 'data': tag})
+                tag_item.setData(0, user_role, {'type': 'tag', 'data': tag})
 
                 # Set color based on score
-                if score > 0.7:
-                    color = QColor("#4CAF50")  # Green - high match
-                elif score > 0.5:
-                    color = QColor("#FFC107")  # Amber - medium match
-                else:
-                    color = QColor("#FF9800")  # Orange - low match
-                tag_item.setForeground(0, color)
-
-                # Add snippets from this tag
-                snippets = self.db_manager.get_snippets_by_tag(tag['id'])
-                for snippet in snippets:
-                    snippet_item = QTreeWidgetItem()
-                    # Display name in first line
-                    name = snippet['name']
-                    snippet_item.setText(0, f"  📄 {name}")
-                    snippet_item.setData(0, Qt.ItemDataRole.UserRole,
-                                       {'type': 'snippet', 'data': snippet})
-                    snippet_item.setForeground(0, QColor("#AAAAAA"))
-
-                    # Add description as child item (second line)
-                    desc = snippet.get('description', '')
-                    if desc:
-                        desc_short = desc if len(desc) <= 50 else desc[:47] + '...'
-                        desc_item = QTreeWidgetItem()
-                        desc_item.setText(0, f"     {desc_short}")
-                        desc_item.setForeground(0, QColor("#888888"))
-                        desc_item.setFlags(desc_item.flags() & ~Qt.ItemFlag.ItemIsSelectable)
-                        snippet_item.addChild(desc_item)
-
-                    tag_item.addChild(snippet_item)
-
-                tags_root.addChild(tag_item)
-
-            tags_root.setExpanded(True)
+                tag_item.setForeground(0, _score_color(score))
+
+                # Add snippets from this tag (cached since the last reload)
+                snippets = self._get_tag_snippets(tag['id'])
+                tag_item.addChildren(self._create_snippet_items(snippets))
+                tag_items.append(tag_item)
+
+            tags_root.addChildren(tag_items)
 
         # Add matching snippets
         if snippet_results:
             snippets_root = QTreeWidgetItem()
             snippets_root.setText(0, f"📄 Matching Snippets ({len(snippet_results)})")
-            snippets_root.setForeground(0, QColor("#64B5F6"))  # Light blue
-            self.tree.addTopLevelItem(snippets_root)
+            snippets_root.setForeground(0, _SNIPPETS_HEADER_COLOR)
+            roots.append(snippets_root)
 
+            snippet_items = []
             for snippet, score in snippet_results:
-                snippet_item = QTreeWidgetItem()
+                snippet_item = tree_item()
                 score_pct = int(score * 100)
                 lang = snippet.get('language', 'text')
                 name = snippet['name']
                 snippet_item.setText(0, f"📄 {name} ({lang}, {score_pct}%)")
-                snippet_item.setData(0, Qt.ItemDataRole.UserRole,
-                                   {'type': 'snippet', 'data': snippet})
+                # The score is kept for the tooltip
+                snippet_item.setData(0, user_role,
+                                   {'type': 'snippet', 'data': snippet, 'score': score})
 
-                # Add description as child item (second line)
+                # Add description as child item (second line, elided by the tree)
                 desc = snippet.get('description', '')
                 if desc:
-                    desc_short = desc if len(desc) <= 50 else desc[:47] + '...'
-                    desc_item = QTreeWidgetItem()
-                    desc_item.setText(0, f"   {desc_short}")
-                    desc_item.setForeground(0, QColor("#888888"))
-                    desc_item.setFlags(desc_item.flags() & ~Qt.ItemFlag.ItemIsSelectable)
+                    desc_item = tree_item()
+                    desc_item.setText(0, f"   {desc}")
+                    desc_item.setForeground(0, _DESCRIPTION_COLOR)
+                    desc_item.setFlags(desc_item.flags() & not_selectable)
                     snippet_item.addChild(desc_item)
 
                 # Set color based on score
-                if score > 0.7:
-                    color = QColor("#4CAF50")  # Green
-                elif score > 0.5:
-                    color = QColor("#FFC107")  # Amber
-                else:
-                    color = QColor("#FF9800")  # Orange
-                snippet_item.setForeground(0, color)
-
-                # Add tooltip with match info
-                snippet_item.setToolTip(0,
-                    f"Match score: {score_pct}%\n"
-                    f"Language: {lang}\n"
-                    f"Usage: {snippet.get('usage_count', 0)} times"
-                )
+                snippet_item.setForeground(0, _score_color(score))
 
-                snippets_root.addChild(snippet_item)
+                snippet_items.append(snippet_item)
 
-            snippets_root.setExpanded(True)
+            snippets_root.addChildren(snippet_items)
 
         # If no results, show message
-        if not snippet_results and not tag_results:
+        if not roots:
             no_results = QTreeWidgetItem()
             no_results.setText(0, f"No results for '{query}'")
-            no_results.setForeground(0, QColor("#888888"))
-            self.tree.addTopLevelItem(no_results)
+            no_results.setForeground(0, _DESCRIPTION_COLOR)
+            roots.append(no_results)
+
+        self.tree.addTopLevelItems(roots)
+
+        # Expand the result groups (only possible once they are in the tree)
+        for root in roots:
+            root.setExpanded(True)
 
     def _on_item_clicked(self, item: QTreeWidgetItem, column: int):
         """Handle tree item click.
@@ -653,22 +1074,38 @@ class GadgetWindow(QMainWindow):
         if item_data['type'] == 'snippet':
             # Show snippet preview with syntax highlighting
             snippet = item_data['data']
+            self._previewed_tag_id = None
             self._show_snippet_preview(snippet)
         elif item_data['type'] == 'tag':
             # Show tag info
             tag = item_data['data']
-            snippets = self.db_manager.get_snippets_by_tag(tag['id'])
+            if tag['id'] == self._previewed_tag_id:
+                return  # Already shown
+
+            self._previewed_tag_id = tag['id']
+            snippets = self._get_tag_snippets(tag['id'])
             if snippets:
                 # Show first snippet with syntax highlighting
                 snippet = snippets[0]
                 self._show_snippet_preview(snippet, tag_prefix=tag['name'])
             else:
-                self.preview.setPlainText(f"No snippets in '{tag['name']}'")
+                self._show_preview_message(f"No snippets in '{tag['name']}'")
                 self.status_label.setText(f"{tag['name']} (empty)")
-                # Remove highlighter for plain text
-                if self.highlighter:
-                    self.highlighter.setDocument(None)
-                    self.highlighter = None
+
+    def _get_tag_snippets(self, tag_id: int) -> list:
+        """Get the snippets of a tag (cached until the tree is reloaded).
+
+        Args:
+            tag_id: Tag ID.
+
+        Returns:
+            List of snippet dictionaries.
+        """
+        snippets = self._tag_snippets_cache.get(tag_id)
+        if snippets is None:
+            snippets = self.db_manager.get_snippets_by_tag(tag_id)
+            self._tag_snippets_cache[tag_id] = snippets
+        return snippets
 
     def _show_snippet_preview(self, snippet: dict, tag_prefix: str = None):
         """Show snippet in preview panel with syntax highlighting.
@@ -677,37 +1114,12 @@ class GadgetWindow(QMainWindow):
             snippet: Snippet dictionary with code and language
             tag_prefix: Optional tag name prefix for status label
         """
-        code = snippet.get('code', '')
         language = snippet.get('language', 'text')
         name = snippet.get('name', 'Unnamed')
 
-        # Set preview text
-        self.preview.setPlainText(code)
-
-        # Apply syntax highlighting
-        if language and language.lower() != 'text':
-            # Normalize language name
-            normalized_lang = normalize_language(language)
-
-            # Create or update highlighter
-            if self.highlighter is None or self.current_language != normalized_lang:
-                # Remove old highlighter if exists
-                if self.highlighter:
-                    self.highlighter.setDocument(None)
-
-                # Create new highlighter
-                self.highlighter = apply_highlighter(
-                    self.preview,
-                    language=normalized_lang,
-                    theme='dark'
-                )
-                self.current_language = normalized_lang
-        else:
-            # Remove highlighter for plain text
-            if self.highlighter:
-                self.highlighter.setDocument(None)
-                self.highlighter = None
-            self.current_language = 'text'
+        # Swap in the snippet's (already laid out and highlighted) document
+        document, self.highlighter = self._get_preview_document(snippet)
+        self.preview.setDocument(document)
 
         # Update status label
         lang_display = language or 'text'
@@ -716,6 +1128,53 @@ class GadgetWindow(QMainWindow):
         else:
             self.status_label.setText(f"{name} ({lang_display})")
 
+    def _get_preview_document(self, snippet: dict):
+        """Get the highlighted preview document for a snippet.
+
+        Documents are cached per snippet, so previewing a snippet again does
+        not re-set, re-lay out and re-highlight its code. A cached document is
+        rebuilt when the snippet's code or language has changed.
+
+        Args:
+            snippet: Snippet dictionary with code and language
+
+        Returns:
+            Tuple of (QTextDocument, CodeHighlighter or None for plain text)
+        """
+        key = snippet.get('id')
+        code = snippet.get('code', '')
+        language = snippet.get('language', 'text')
+
+        cached = self._preview_documents.get(key)
+        if cached is not None and cached[0] == code and cached[1] == language:
+            self._preview_documents.move_to_end(key)
+            return cached[2], cached[3]
+
+        document = QTextDocument()
+        document.setDefaultFont(self.preview.font())
+        document.setPlainText(code)
+
+        # Apply syntax highlighting
+        highlighter = None
+        if language and language.lower() != 'text':
+            highlighter = CodeHighlighter(document, normalize_language(language), 'dark')
+
+        self._preview_documents[key] = (code, language, document, highlighter)
+        if len(self._preview_documents) > self.PREVIEW_CACHE_SIZE:
+            self._preview_documents.popitem(last=False)
+
+        return document, highlighter
+
+    def _show_preview_message(self, text: str):
+        """Show a plain message in the preview panel.
+
+        Args:
+            text: Message to show.
+        """
+        self.preview.setDocument(self._message_document)
+        self.preview.setPlainText(text)
+        self.highlighter = None
+
     def _on_item_double_clicked(self, item: QTreeWidgetItem, column: int):
         """Handle tree item double click (copy to clipboard).
 
@@ -728,7 +1187,6 @@ class GadgetWindow(QMainWindow):
         if not item_data:
             return
 
-        from PyQt6.QtWidgets import QApplication
         clipboard = QApplication.clipboard()
 
         if item_data['type'] == 'snippet':
@@ -737,18 +1195,16 @@ class GadgetWindow(QMainWindow):
             clipboard.setText(snippet['code'])
             self.status_label.setText(f"✓ Copied '{snippet['name']}' to clipboard!")
 
-            # Update usage count
-            with self.db_manager.get_local_session() as session:
-                from src.models.models import Snippet
-                db_snippet = session.query(Snippet).filter(Snippet.id == snippet['id']).first()
-                if db_snippet:
-                    db_snippet.increment_usage()
-                    session.commit()
+            # Count the use; written to the database in one batch later
+            self._pending_usage[snippet['id']] += 1
+            if not self._usage_timer.isActive():
+                self._usage_timer.start()
 
         elif item_data['type'] == 'tag':
             # Copy first snippet in tag
+            # (the click handler already fetched and cached these)
             tag = item_data['data']
-            snippets = self.db_manager.get_snippets_by_tag(tag['id'])
+            snippets = self._get_tag_snippets(tag['id'])
             if snippets:
                 clipboard.setText(snippets[0]['code'])
                 self.status_label.setText(f"✓ Copied '{snippets[0]['name']}' to clipboard!")
@@ -767,21 +1223,7 @@ class GadgetWindow(QMainWindow):
         if not item_data:
             return
 
-        menu = QMenu(self)
-        menu.setStyleSheet("""
-            QMenu {
-                background-color: #2E2E2E;
-                color: white;
-                border: 1px solid #444444;
-                padding: 5px;
-            }
-            QMenu::item {
-                padding: 5px 20px;
-            }
-            QMenu::item:selected {
-                background-color: #0D47A1;
-            }
-        """)
+        menu = QMenu(self)  # Styled by MENU_QSS on the window
 
         if item_data['type'] == 'snippet':
             snippet = item_data['data']
@@ -826,7 +1268,6 @@ class GadgetWindow(QMainWindow):
         Args:
             snippet: Snippet data dictionary.
         """
-        from PyQt6.QtWidgets import QApplication
         clipboard = QApplication.clipboard()
         clipboard.setText(snippet['code'])
         self.status_label.setText(f"✓ Copied '{snippet['name']}' to clipboard!")
@@ -866,11 +1307,12 @@ class GadgetWindow(QMainWindow):
 
         if reply == QMessageBox.StandardButton.Yes:
             # Delete from database
+            tag_ids = self._tags_of_snippet(snippet['id'])
             success = self.db_manager.delete_snippet(snippet['id'])
 
             if success:
                 self.status_label.setText(f"✓ Deleted '{snippet['name']}'")
-                self._load_data()  # Reload tree
+                self._update_tag_rows(tag_ids)  # Update the affected tags
             else:
                 self.status_label.setText(f"✗ Failed to delete '{snippet['name']}'")
 
@@ -936,8 +1378,8 @@ class GadgetWindow(QMainWindow):
             tag_ids=snippet_data.get('tag_ids', [])
         )
 
-        # Reload tree
-        self._load_data()
+        # Show the new snippet under its tags
+        self._update_tag_rows(snippet_data.get('tag_ids', []))
 
     def _open_settings(self):
         """Open settings dialog (from Settings button)."""
@@ -983,8 +1425,8 @@ class GadgetWindow(QMainWindow):
 
         # TODO: Update tag associations
 
-        # Reload tree
-        self._load_data()
+        # Update the rows of the tags showing this snippet
+        self._update_tag_rows(self._tags_of_snippet(snippet_data['id']))
 
     def toggle_visibility(self):
         """Toggle window visibility with animation."""
@@ -995,33 +1437,87 @@ class GadgetWindow(QMainWindow):
 
     def show_window(self):
         """Show window with fade-in animation."""
+        self._fading_out = False
         self.show()
         self.is_visible = True
 
-        # Animate opacity
-        self.fade_animation.setStartValue(self.config.appearance.opacity_inactive)
-        self.fade_animation.setEndValue(self.config.appearance.opacity_active)
-        self.fade_animation.start()
+        # Animate opacity (or set it directly when transitions are off)
+        if self.config.appearance.opacity_transition <= 0:
+            self.fade_animation.stop()
+            self.setWindowOpacity(self.config.appearance.opacity_active)
+        else:
+            self._start_fade(self.config.appearance.opacity_inactive,
+                             self.config.appearance.opacity_active)
 
         # Focus search box
         self.search_input.setFocus()
 
     def hide_window(self):
         """Hide window with fade-out animation."""
-        self.fade_animation.setStartValue(self.config.appearance.opacity_active)
-        self.fade_animation.setEndValue(self.config.appearance.opacity_inactive)
-        self.fade_animation.finished.connect(self._finish_hide)
+        self._fading_out = True
+
+        if self.config.appearance.opacity_transition <= 0:
+            self.fade_animation.stop()
+            self.setWindowOpacity(self.config.appearance.opacity_inactive)
+            self._finish_hide()
+            return
+
+        self._start_fade(self.config.appearance.opacity_active,
+                         self.config.appearance.opacity_inactive)
+
+    def _start_fade(self, start: float, end: float):
+        """(Re)start the fade animation between two opacities.
+
+        Args:
+            start: Opacity at the beginning of the fade.
+            end: Opacity at the end of the fade.
+        """
+        self.fade_animation.stop()
+        self._fade_range = (start, end)
+        self.setWindowOpacity(start)
         self.fade_animation.start()
 
+    def _on_fade_step(self, progress: float):
+        """Apply one frame of the fade animation.
+
+        Args:
+            progress: Eased progress from 0.0 to 1.0.
+        """
+        start, end = self._fade_range
+        self.setWindowOpacity(start + (end - start) * progress)
+
+    def _on_fade_finished(self):
+        """Handle the end of a fade animation."""
+        if self._fading_out:
+            self._finish_hide()
+
     def _finish_hide(self):
         """Complete hiding after animation."""
+        self._fading_out = False
         self.hide()
         self.is_visible = False
-        self.fade_animation.finished.disconnect(self._finish_hide)
+
+    def _flush_usage(self):
+        """Write collected snippet usage counts to the database."""
+        self._usage_timer.stop()
+        if not self._pending_usage:
+            return
+
+        counts = dict(self._pending_usage)
+        self._pending_usage.clear()
+        try:
+            self.db_manager.add_usage_counts(counts)
+        except Exception as e:
+            print(f"⚠ Warning: Failed to save usage counts: {e}")
+
+    def closeEvent(self, event):
+        """Save pending usage counts before the window closes."""
+        self._flush_usage()
+        super().closeEvent(event)
 
     def close_application(self):
         """Close the entire application."""
-        from PyQt6.QtWidgets import QApplication
+        self._flush_usage()
         QApplication.quit()
 
     def toggle_minimize(self):
@@ -1051,41 +1547,19 @@ class GadgetWindow(QMainWindow):
         # Get current window flags
         flags = self.windowFlags()
 
+        # Restyle the button from the shared style sheet (no new sheet to parse)
+        self.btn_always_on_top.setProperty("pinned", self.is_always_on_top)
+        style = self.btn_always_on_top.style()
+        style.unpolish(self.btn_always_on_top)
+        style.polish(self.btn_always_on_top)
+
         if self.is_always_on_top:
             # Add WindowStaysOnTopHint flag
             flags |= Qt.WindowType.WindowStaysOnTopHint
-            self.btn_always_on_top.setStyleSheet("""
-                QPushButton {
-                    background-color: rgba(40, 205, 65, 255);
-                    border: 1px solid rgba(30, 160, 50, 255);
-                    border-radius: 7px;
-                }
-                QPushButton:hover {
-                    background-color: rgba(40, 205, 65, 255);
-                    border: 1px solid rgba(20, 100, 35, 255);
-                }
-                QPushButton:pressed {
-                    background-color: rgba(30, 160, 50, 255);
-                }
-            """)
             self.btn_always_on_top.setToolTip("常に最前面に固定中（クリックで解除）")
         else:
             # Remove WindowStaysOnTopHint flag
             flags &= ~Qt.WindowType.WindowStaysOnTopHint
-            self.btn_always_on_top.setStyleSheet("""
-                QPushButton {
-                    background-color: rgba(40, 205, 65, 120);
-                    border: 1px solid rgba(30, 160, 50, 255);
-                    border-radius: 7px;
-                }
-                QPushButton:hover {
-                    background-color: rgba(40, 205, 65, 180);
-                    border: 1px solid rgba(20, 100, 35, 255);
-                }
-                QPushButton:pressed {
-                    background-color: rgba(30, 160, 50, 255);
-                }
-            """)
             self.btn_always_on_top.setToolTip("通常モード（クリックで最前面に固定）")
 
         # Apply new flags
@@ -1201,5 +1675,16 @@ class GadgetWindow(QMainWindow):
                 # No scrollable widget found - consume event completely
                 return True  # Block event
 
+        # Snippet tooltips are built on hover instead of for every row
+        if event.type() == QEvent.Type.ToolTip and obj is self.tree.viewport():
+            item = self.tree.itemAt(event.pos())
+            tooltip = self._snippet_tooltip(item) if item else None
+            if tooltip:
+                QToolTip.showText(event.globalPos(), tooltip, obj)
+            else:
+                QToolTip.hideText()
+                event.ignore()
+            return True
+
         # Let other events pass through
         return super().eventFilter(obj, event)
@@ -174,6 +174,10 @@ def main():
         db_manager = DatabaseManager(config)
         window = GadgetWindow(config, db_manager)
 
+        # The tree is filled once the window is first shown
+        window.show()
+        app.processEvents()
+
         print("\n[Test 1] GUI Initialization")
         print("-" * 50)
         print(f"✓ Window created")
@@ -0,0 +1,381 @@
+"""
+Test script for performance optimizations.
+
+Tests:
+- Trusted config reload (checksum + model_construct)
+- FTS5-backed snippet search
+- Versioned tag/snippet caches
+- Local/shared merging through an ATTACHed database
+- Batched fuzzy snippet scoring
+- Incremental tree updates after snippet edits
+"""
+
+import os
+import sys
+import json
+import sqlite3
+import tempfile
+from pathlib import Path
+
+# Add src to Python path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from src.utils.config import Config, load_config, save_config, CHECKSUM_KEY
+from src.utils.database import DatabaseManager
+from src.utils.fuzzy_search import FuzzySearcher, calculate_snippet_score, fuzzy_search_snippets
+
+
+def test_config_trusted_reload():
+    """Test config round trip through save_config/load_config."""
+    print("\n[Test 1] Trusted Config Reload")
+    print("-" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config_path = Path(tmp_dir) / 'config.json'
+
+        config = Config()
+        config.appearance.position = 'left'
+        config.search.max_results = 100
+        assert save_config(config, config_path), "save_config failed"
+
+        # Written file carries a checksum
+        with open(config_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        assert CHECKSUM_KEY in data, "Checksum not written"
+
+        # Trusted reload keeps nested models intact
+        loaded = load_config(config_path)
+        assert loaded.model_dump() == config.model_dump(), "Round trip mismatch"
+        assert loaded.appearance.position == 'left'
+        assert loaded.database.local.path == config.database.local.path
+        print("✓ Trusted reload matches saved config")
+
+        # External edit invalidates the checksum -> full validation
+        data['appearance']['position'] = 'middle'
+        with open(config_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        fallback = load_config(config_path)
+        assert fallback.appearance.position == 'right', "Invalid value was not rejected"
+        print("✓ Edited config falls back to validation")
+
+    return True
+
+
+def test_fts_search():
+    """Test full-text snippet search and index maintenance."""
+    print("\n[Test 2] FTS Snippet Search")
+    print("-" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config = Config()
+        config.database.local.path = str(Path(tmp_dir) / 'fts.db')
+        db_manager = DatabaseManager(config)
+
+        try:
+            list_id = db_manager.add_snippet(
+                "List Comprehension", "[x for x in y]", "python",
+                "Python list comprehension"
+            )
+            db_manager.add_snippet("Flask Route", "@app.route('/')", "python")
+            db_manager.add_snippet("100% coverage", "pass", "python")
+
+            results = db_manager.search_snippets("comp")
+            assert [r['id'] for r in results] == [list_id], "FTS search failed"
+            print("✓ Search uses FTS index")
+
+            # Substrings match anywhere, as with LIKE (incl. Japanese text)
+            sort_id = db_manager.add_snippet(
+                "QuickSort impl", "def qs(a): pass", "python", "配列を並べ替える関数"
+            )
+            for query in ("Sort", "sort", "ort", "並べ替え", "So"):
+                results = db_manager.search_snippets(query)
+                assert [r['id'] for r in results] == [sort_id], f"Substring search failed: {query}"
+            print("✓ Substring search matches LIKE semantics")
+
+            # Index follows updates and deletes
+            db_manager.update_snippet(list_id, name="Dict Comprehension")
+            assert db_manager.search_snippets("dict"), "Update not indexed"
+            db_manager.delete_snippet(list_id)
+            assert not db_manager.search_snippets("dict"), "Delete not indexed"
+            print("✓ Triggers keep the index in sync")
+
+            # Special characters are matched literally
+            assert db_manager.search_snippets('"') == []
+            assert len(db_manager.search_snippets("100%")) == 1
+            print("✓ Special characters handled")
+        finally:
+            db_manager.close()
+
+        # An index built with the old word tokenizer is replaced on startup
+        with sqlite3.connect(config.database.local.path) as conn:
+            conn.execute("DROP TABLE snippet_fts")
+            conn.execute(
+                "CREATE VIRTUAL TABLE snippet_fts USING fts5("
+                "name, description, content='snippets', content_rowid='id')"
+            )
+        db_manager = DatabaseManager(config)
+        try:
+            assert db_manager.local_fts
+            assert [r['name'] for r in db_manager.search_snippets("ort")] == ["QuickSort impl"]
+            print("✓ Old FTS index rebuilt with trigram tokenizer")
+        finally:
+            db_manager.close()
+
+    return True
+
+
+def test_result_caches():
+    """Test that cached lists are reused until data changes."""
+    print("\n[Test 3] Tag/Snippet Caches")
+    print("-" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config = Config()
+        config.database.local.path = str(Path(tmp_dir) / 'cache.db')
+        db_manager = DatabaseManager(config)
+
+        try:
+            tag_id = db_manager.get_or_create_tag("Python")
+            tags = db_manager.get_all_tags()
+            assert db_manager.get_all_tags() is tags, "Tag cache not reused"
+
+            db_manager.get_or_create_tag("Django", parent_id=tag_id)
+            tags = db_manager.get_all_tags()
+            assert [t['full_path'] for t in tags if t['name'] == 'Django'] == ['Python > Django']
+            print("✓ Tag cache invalidated on tag creation")
+
+            snippet_id = db_manager.add_snippet("Hello", "print('hi')", "python", tag_ids=[tag_id])
+            assert db_manager.get_all_tags() is tags, "Tag cache dropped by snippet write"
+            db_manager.increment_usage(snippet_id)
+            db_manager.add_usage_counts({snippet_id: 1})
+            assert db_manager.get_all_tags() is tags, "Tag cache dropped by usage update"
+            print("✓ Tag cache kept across snippet writes")
+
+            grouped = db_manager.get_snippets_grouped_by_tag()
+            assert grouped == {tag_id: db_manager.get_snippets_by_tag(tag_id)}
+            snippets = db_manager.get_all_snippets()
+            assert db_manager.get_all_snippets() is snippets, "Snippet cache not reused"
+
+            db_manager.increment_usage(snippet_id)
+            snippets = db_manager.get_all_snippets()
+            assert snippets[0]['usage_count'] == 3, "Stale usage count"
+            print("✓ Snippet cache invalidated on usage update")
+
+            # Writes from another connection (e.g. import_snippets.py)
+            with sqlite3.connect(config.database.local.path) as conn:
+                conn.execute("UPDATE snippets SET name = 'Renamed' WHERE id = ?", (snippet_id,))
+                conn.execute("INSERT INTO tags (name, type) VALUES ('Outside', 'folder')")
+            conn.close()
+            assert db_manager.get_all_snippets()[0]['name'] == 'Renamed', "Outside write missed"
+            assert 'Outside' in [t['name'] for t in db_manager.get_all_tags()]
+            print("✓ Caches invalidated by writes from other connections")
+        finally:
+            db_manager.close()
+
+    return True
+
+
+def test_attached_shared_merge():
+    """Test that local and shared results are merged in one query."""
+    print("\n[Test 4] Attached Shared Database")
+    print("-" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        shared_path = Path(tmp_dir) / 'shared.db'
+
+        # Build a shared database with the normal schema
+        shared_config = Config()
+        shared_config.database.local.path = str(shared_path)
+        shared_manager = DatabaseManager(shared_config)
+        shared_manager.add_snippet("Shared List Helper", "pass", "python")
+        shared_id = shared_manager.add_snippet("Shared Logger", "pass", "python")
+        shared_manager.increment_usage(shared_id)
+        shared_manager.close()
+
+        config = Config()
+        config.database.local.path = str(Path(tmp_dir) / 'local.db')
+        config.database.shared.enabled = True
+        config.database.shared.path = str(shared_path)
+        config.database.mode = 'hybrid'
+        db_manager = DatabaseManager(config)
+
+        try:
+            assert db_manager.shared_attached, "Shared database not attached"
+            db_manager.add_snippet("Local List", "pass", "python")
+
+            results = db_manager.search_snippets("list")
+            assert sorted(r['source'] for r in results) == ['local', 'shared']
+            assert len(db_manager.search_snippets("list", limit=1)) == 1
+            print("✓ Search merges both databases with LIMIT")
+
+            names = [(s['source'], s['name']) for s in db_manager.get_all_snippets()]
+            assert names == [
+                ('local', 'Local List'),
+                ('shared', 'Shared List Helper'),
+                ('shared', 'Shared Logger'),
+            ], names
+            print("✓ Listing keeps local snippets first")
+
+            # Changes to the shared database by other users are noticed
+            with sqlite3.connect(shared_path) as conn:
+                conn.execute("UPDATE snippets SET name = 'Shared Tracer' WHERE id = ?", (shared_id,))
+            conn.close()
+            assert 'Shared Tracer' in [s['name'] for s in db_manager.get_all_snippets()]
+            print("✓ Shared database changes invalidate the cache")
+
+            # The attached shared database is read-only
+            try:
+                with db_manager.get_local_session() as session:
+                    session.execute(text("DELETE FROM shared.snippets"))
+                    session.commit()
+            except OperationalError:
+                pass
+            else:
+                raise AssertionError("Write to shared database succeeded")
+            with db_manager.get_shared_session() as session:
+                assert session.execute(text("SELECT COUNT(*) FROM snippets")).scalar() == 2
+            print("✓ Shared database is read-only")
+        finally:
+            db_manager.close()
+
+    return True
+
+
+def test_batch_fuzzy_scores():
+    """Test that batched fuzzy search matches per-snippet scoring."""
+    print("\n[Test 5] Batched Fuzzy Scoring")
+    print("-" * 50)
+
+    snippets = [
+        {'name': 'List Comprehension', 'code': '[x for x in y]',
+         'description': 'Python list comprehension', 'language': 'python'},
+        {'name': 'Flask Route', 'code': "@app.route('/')",
+         'description': None, 'language': 'python'},
+        {'name': 'list', 'code': '', 'description': '', 'language': ''},
+        {'name': 'React Hook', 'code': 'useState(0)',
+         'description': 'State hook', 'language': 'javascript'},
+    ]
+
+    for query in ("list", "Pyton", "hook"):
+        results = fuzzy_search_snippets(query, snippets, threshold=0.0)
+        assert len(results) == len(snippets)
+        for snippet, score in results:
+            expected = calculate_snippet_score(query, snippet)
+            assert abs(score - expected) < 1e-6, (query, snippet['name'], score, expected)
+        scores = [score for _, score in results]
+        assert scores == sorted(scores, reverse=True), "Results not sorted"
+    print("✓ Batch scores match calculate_snippet_score")
+
+    results = fuzzy_search_snippets("list", snippets, threshold=0.3, max_results=1)
+    assert [s['name'] for s, _ in results] == ['List Comprehension'], results
+    print("✓ Top-k selection respects max_results")
+
+    # Incremental search must match a full rescan at every keystroke
+    searcher = FuzzySearcher(threshold=0.3)
+    for query in ("r", "re", "rea", "reac", "re", "ro", "rou", "route"):
+        expected = fuzzy_search_snippets(query, snippets, threshold=0.3)
+        actual = searcher.search(query, snippets)
+        assert [(s['name'], round(v, 6)) for s, v in actual] == \
+            [(s['name'], round(v, 6)) for s, v in expected], query
+    print("✓ Incremental search matches full rescan")
+
+    return True
+
+
+def test_incremental_tree_updates():
+    """Test that snippet edits update tag rows without a full reload."""
+    print("\n[Test 6] Incremental Tree Updates")
+    print("-" * 50)
+
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt6.QtWidgets import QApplication
+    from src.views.gadget_window import GadgetWindow
+
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config = Config()
+        config.database.local.path = str(Path(tmp_dir) / 'tree.db')
+        db_manager = DatabaseManager(config)
+
+        try:
+            tag_id = db_manager.get_or_create_tag("Python")
+            snippet_id = db_manager.add_snippet("Hello", "print('hi')", "python", tag_ids=[tag_id])
+
+            window = GadgetWindow(config, db_manager)
+            window._load_data()
+
+            reloads = []
+            load_data = window._load_data
+            window._load_data = lambda: (reloads.append(1), load_data())
+
+            window._on_snippet_created({
+                'name': 'World', 'code': 'pass', 'language': 'python', 'tag_ids': [tag_id]
+            })
+            window._on_snippet_updated({
+                'id': snippet_id, 'name': 'Hello again', 'code': 'pass', 'language': 'python'
+            })
+            assert not reloads, "Snippet edits reloaded the whole tree"
+            assert window._tag_items[tag_id].text(0).endswith("(2)"), "Tag row not updated"
+            print("✓ Snippet edits update only the affected tag rows")
+
+            # Another connection changes a snippet but no tags
+            with sqlite3.connect(config.database.local.path) as conn:
+                conn.execute("UPDATE snippets SET code = 'pass' WHERE id = ?", (snippet_id,))
+            conn.close()
+            window._update_tag_rows([tag_id])
+            assert not reloads, "Unchanged tags reloaded the whole tree"
+
+            db_manager.get_or_create_tag("Rust")
+            window._update_tag_rows([tag_id])
+            assert len(reloads) == 1, "New tag did not reload the tree"
+            print("✓ Whole tree reloaded only when tags change")
+
+            window.close()
+        finally:
+            db_manager.close()
+
+    return True
+
+
+def main():
+    """Run all tests."""
+    print("=" * 50)
+    print("Performance Tests")
+    print("=" * 50)
+
+    try:
+        results = []
+        results.append(test_config_trusted_reload())
+        results.append(test_fts_search())
+        results.append(test_result_caches())
+        results.append(test_attached_shared_merge())
+        results.append(test_batch_fuzzy_scores())
+        results.append(test_incremental_tree_updates())
+
+        print("\n" + "=" * 50)
+        print("Test Summary")
+        print("=" * 50)
+        passed = sum(results)
+        total = len(results)
+        print(f"Passed: {passed}/{total}")
+
+        if all(results):
+            print("\n✓ All performance tests passed!")
+            return 0
+        else:
+            print("\n✗ Some tests failed")
+            return 1
+
+    except Exception as e:
+        print(f"\n✗ Test failed with exception: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())